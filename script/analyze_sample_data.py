@@ -9,12 +9,16 @@ pio.renderers.default = 'browser'
 from plotly.subplots import make_subplots
 import plotly.graph_objects as go
 
+from excel_cache import read_excel_cached
+from time_parse import export_date_range, split_vendor_time, infer_year, vendor_timestamps
+from vendor_schema import normalize
+
 os.chdir(r"D:\GitHub\wireless_communication")
 base_dir = "ignore/radio_data_20230913_20231013"
 
 def processData(file_path, file_name):
     # read excel sheet with multi-line header
-    df = pd.read_excel(file_path, sheet_name = 'Sheet1', header = [0, 1])
+    df = read_excel_cached(file_path, sheet_name = 'Sheet1', header = [0, 1])
     
     # modify multi-header to single header for column names
     df.columns = ['_'.join(col) if not pd.isnull(col[1]) else col[0] for col in df.columns]
@@ -23,30 +27,24 @@ def processData(file_path, file_name):
     df.columns = df.columns.str.replace(r'[()]', '', regex = True) # remove parantheses
     df.columns = df.columns.str.strip().str.replace(' ', '_') # strip whitespace and add underscore
     
-    # split time into month, date and hour
-    df[['month', 'date', 'hour']] = df['Time'].str.extract(r'(\w+) (\d+) (\d+:\d+)')
-    
-    # datetime conversion
-    df['month'] = pd.to_datetime(df['month'], format = '%b').dt.month
-    df['date'] = df['date'].astype(int)
-    df['hour'] = pd.to_datetime(df['hour'], format = '%H:%M').dt.hour
-    
-    # create timestamp object
-    df['Time'] = pd.to_datetime('2023-' + df['month'].astype(str) + '-' + df['date'].astype(str)  + ' ' + df['hour'].astype(str) + ':00:00')
+    # map radio columns to the canonical schema (packet loss in %)
+    start, end = export_date_range(file_path)
+    month, date, hour = split_vendor_time(df['Time'])
+    df['Time'] = vendor_timestamps(infer_year(month, start), month, date, hour)
+    df = normalize(df, 'radio_flat', node = file_name)
     
-    # filter data for September and select columns
-    cols = ['Up_Mbps', 'Down_Mbps', 'Latency_ms', 'Packet_Loss', '2.4_GHz_Noise', '5.8_GHz_Noise', 'date']
-    df = df.loc[df.month == 9, cols]
+    # filter data for September
+    df = df[df.DateTime.dt.month == 9]
     
     # compute average of metrics by date
-    adf = df.groupby('date').agg(Up_Mbps = ('Up_Mbps', 'mean'),
-                                 Down_Mbps = ('Down_Mbps', 'mean'),
-                                 Latency_ms = ('Latency_ms', 'mean'),
-                                 Packet_Loss = ('Packet_Loss', 'mean')).reset_index()
+    adf = df.groupby(df.DateTime.dt.day.rename('date')).agg(Upload = ('Upload', 'mean'),
+                                                            Download = ('Download', 'mean'),
+                                                            Latency = ('Latency', 'mean'),
+                                                            PacketLoss = ('PacketLoss', 'mean')).reset_index()
     
     # # pivot longer
     # adf = pd.melt(adf, id_vars = ['date'], var_name = 'Metrics', value_name = 'value')
-    adf['intersection'] = file_name
+    adf['Node'] = file_name
     
     return adf
 
@@ -68,43 +66,42 @@ adf = pd.concat(file_data)
 # latency analysis
 # =============================================================================
 
-fig_lat_line = px.line(adf, x = 'date', y = 'Latency_ms', color = 'intersection',
-                       labels = {'date': 'Dates in September', 'Latency_ms': 'Latency in millisecond'})
+fig_lat_line = px.line(adf, x = 'date', y = 'Latency', color = 'Node',
+                       labels = {'date': 'Dates in September', 'Latency': 'Latency in millisecond'})
 fig_lat_line.update_layout(legend = dict(yanchor = 'top', y = 0.99, xanchor = 'left', x = 0.01))
 fig_lat_line.show()
 
-fig_lat_box = px.box(adf, x = 'intersection', y = 'Latency_ms',
-                     labels = {'intersection': 'Intersection', 'Latency_ms': 'Latency in millisecond'})
+fig_lat_box = px.box(adf, x = 'Node', y = 'Latency',
+                     labels = {'Node': 'Intersection', 'Latency': 'Latency in millisecond'})
 fig_lat_box.show()
 
 # =============================================================================
 # packet loss analysis
 # =============================================================================
 
-fig_pac_line = px.line(adf, x = 'date', y = 'Packet_Loss', color = 'intersection', 
+fig_pac_line = px.line(adf, x = 'date', y = 'PacketLoss', color = 'Node', 
                        labels = {'date': 'Dates in September', 
-                                 'Packet_Loss': 'Packet Loss (%)'})
+                                 'PacketLoss': 'Packet Loss (%)'})
 fig_pac_line.update_layout(legend = dict(yanchor = 'top', y = 0.99, xanchor = 'left', x = 0.01))
 fig_pac_line.show()
 
-fig_pac_box = px.box(adf, x = 'intersection', y = 'Packet_Loss',
-                     labels = {'intersection': 'Intersection'})
+fig_pac_box = px.box(adf, x = 'Node', y = 'PacketLoss',
+                     labels = {'Node': 'Intersection', 'PacketLoss': 'Packet Loss (%)'})
 fig_pac_box.show()
 
 # =============================================================================
 # throughput analysis
 # =============================================================================
 
-tdf = adf[['Up_Mbps', 'Down_Mbps', 'date', 'intersection']].copy(deep = True)
-tdf = pd.melt(tdf, id_vars = ['date', 'intersection'], var_name = 'Throughput_Metrics', value_name = 'value')
+tdf = pd.melt(adf, id_vars = ['date', 'Node'], value_vars = ['Upload', 'Download'], var_name = 'Throughput_Metrics', value_name = 'value')
 
-fig_thru_line = px.line(tdf, x = 'date', y = 'value', color = 'intersection', facet_col = 'Throughput_Metrics', 
+fig_thru_line = px.line(tdf, x = 'date', y = 'value', color = 'Node', facet_col = 'Throughput_Metrics', 
                         labels = {'date': 'Dates in September', 'value': 'Speed in Mbps'})
 fig_thru_line.update_layout(legend = dict(yanchor = 'top', y = 0.99, xanchor = 'left', x = 0.01))
 fig_thru_line.show()
 
-fig_thru_box = px.box(tdf, x = 'intersection', y = 'value', color = 'Throughput_Metrics',
-                      labels = {'intersection': 'Intersection', 'value': 'Speed in Mbps'})
+fig_thru_box = px.box(tdf, x = 'Node', y = 'value', color = 'Throughput_Metrics',
+                      labels = {'Node': 'Intersection', 'value': 'Speed in Mbps'})
 fig_thru_box.update_layout(legend = dict(yanchor = 'top', y = 0.99, xanchor = 'left', x = 0.01))
 fig_thru_box.show()
 
@@ -0,0 +1,143 @@
+import os
+import re
+import joblib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from sklearn.ensemble import IsolationForest
+
+# =============================================================================
+# streaming anomaly detection with per-Area or per-Node Isolation Forests
+# =============================================================================
+
+# default location of persisted models
+model_dir = "ignore/anomaly_models"
+
+# function to build model file path of a group (Area or Node name)
+def model_path(model_dir, key):
+    return os.path.join(model_dir, re.sub(r'[^\w\-]+', '_', str(key)) + '.joblib')
+
+# function to fit an Isolation Forest on a window of rows and persist it
+def fit_model(window_df, features, contamination, random_state, path):
+    model = IsolationForest(contamination = contamination, random_state = random_state)
+    model.fit(window_df[features])
+
+    fitted = {'model': model, 'features': features,
+              'fitted_at': window_df.Time.max(), 'n_rows': len(window_df)}
+
+    # write to a temporary file first so a crash never leaves a broken model
+    tmp_path = path + '.tmp'
+    joblib.dump(fitted, tmp_path)
+    os.replace(tmp_path, path)
+
+    return fitted
+
+class StreamingAnomalyDetector:
+    # key: 'Area' or 'Node', one model is kept per value
+    # window: rolling window of rows the models are fit on
+    # refit_every: time between refits of a model (in data time)
+    def __init__(self, features, key = 'Area', window = '14D', refit_every = '24h',
+                 min_rows = 100, contamination = 0.01, random_state = 42,
+                 model_dir = model_dir, max_workers = 2):
+        self.features = list(features)
+        self.key = key
+        self.window = pd.Timedelta(window)
+        self.refit_every = pd.Timedelta(refit_every)
+        self.min_rows = min_rows
+        self.contamination = contamination
+        self.random_state = random_state
+        self.model_dir = model_dir
+
+        self.models = {} # fitted model of each group
+        self.buffers = {} # rolling window of rows of each group
+        self.pending = {} # background refits of each group
+        self.executor = ThreadPoolExecutor(max_workers = max_workers)
+
+        os.makedirs(model_dir, exist_ok = True)
+
+    # load persisted model of a group so startup does not retrain from scratch
+    def load_model(self, group):
+        path = model_path(self.model_dir, group)
+        if group not in self.models and os.path.exists(path):
+            fitted = joblib.load(path)
+            if fitted['features'] == self.features:
+                self.models[group] = fitted
+
+        return self.models.get(group)
+
+    # swap in models whose background refit has finished
+    def collect_refits(self):
+        for group, future in list(self.pending.items()):
+            if future.done():
+                self.models[group] = future.result()
+                del self.pending[group]
+
+    # append rows to the rolling window of a group
+    def update_buffer(self, group, rows):
+        buffer = pd.concat([self.buffers.get(group), rows[['Time'] + self.features]], ignore_index = True)
+        self.buffers[group] = buffer[buffer.Time > buffer.Time.max() - self.window]
+
+    # start a refit of a group (synchronously if it has no model yet)
+    def schedule_refit(self, group):
+        buffer = self.buffers[group]
+        fitted = self.models.get(group)
+        if group in self.pending or len(buffer) < self.min_rows:
+            return
+        if fitted is not None and buffer.Time.max() - fitted['fitted_at'] < self.refit_every:
+            return
+
+        args = (buffer.copy(), self.features, self.contamination, self.random_state,
+                model_path(self.model_dir, group))
+        if fitted is None:
+            self.models[group] = fit_model(*args)
+        else:
+            self.pending[group] = self.executor.submit(fit_model, *args)
+
+    # score incoming rows and update rolling windows
+    # adds anomaly_score (-1 anomaly, 1 normal, nan without model), score and is_anomaly columns
+    def score(self, rows):
+        self.collect_refits()
+
+        rows = rows.dropna(subset = self.features)
+        anomaly_score = np.full(len(rows), np.nan)
+        score = np.full(len(rows), np.nan)
+
+        # score rows of each group by position with the group's current model
+        for group, pos in rows.groupby(self.key, sort = False, observed = True).indices.items():
+            grows = rows.iloc[pos]
+            fitted = self.load_model(group)
+            if fitted is not None:
+                X = grows[self.features]
+                anomaly_score[pos] = fitted['model'].predict(X)
+                score[pos] = fitted['model'].decision_function(X)
+
+            self.update_buffer(group, grows)
+            self.schedule_refit(group)
+
+        return rows.assign(anomaly_score = anomaly_score, score = score,
+                           is_anomaly = anomaly_score == -1)
+
+    # wait for background refits to finish
+    def close(self):
+        self.executor.shutdown(wait = True)
+        self.collect_refits()
+
+# =============================================================================
+# replay January 2024 data hourly through the streaming detector
+# =============================================================================
+
+if __name__ == '__main__':
+    from radio_store import read_store
+
+    os.chdir(r"D:\GitHub\wireless_communication")
+
+    perf_metrics = ['Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)', 'Packet Loss']
+    df = read_store(columns = ['Area', 'Node', 'Time'] + perf_metrics, months = ['2024-01'])
+
+    detector = StreamingAnomalyDetector(perf_metrics, key = 'Area')
+    for time, hourly_rows in df.groupby('Time'):
+        flagged = detector.score(hourly_rows)
+        for node in flagged[flagged.is_anomaly].Node:
+            print(f"{time}: anomaly at {node}")
+    detector.close()
@@ -0,0 +1,114 @@
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from model_registry import targets, xgb_params
+
+# =============================================================================
+# rolling-origin (walk-forward) backtest of the XGBoost regressors
+# =============================================================================
+
+# columns of backtest results (one row per target, fold and node)
+result_cols = ['Target', 'Fold', 'TrainStart', 'TestStart', 'TestEnd', 'Node', 'N', 'MAPE', 'RMSE']
+
+# function to list folds as (train start, train end, test end) row positions of time-sorted data
+# train_days: initial training period, test_days: length of each test period
+# window: 'expanding' keeps all past rows, 'rolling' keeps only the last train_days
+def rolling_folds(times, train_days = 14, test_days = 1, window = 'expanding'):
+    times = np.asarray(times, dtype = 'datetime64[ns]')
+    if not len(times):
+        return []
+    train = np.timedelta64(train_days, 'D')
+    test = np.timedelta64(test_days, 'D')
+
+    folds = []
+    origin = times[0] + train
+    while origin < times[-1]:
+        cut = np.searchsorted(times, origin)
+        end = np.searchsorted(times, origin + test)
+        start = 0 if window == 'expanding' else np.searchsorted(times, origin - train)
+        if end > cut:
+            folds.append((int(start), int(cut), int(end)))
+        origin = origin + test
+
+    return folds
+
+# function to compute MAPE and RMSE of each node from a test period
+def node_errors(node_codes, y, y_pred, n_nodes):
+    eps = np.finfo(np.float64).eps
+    err = y_pred - y
+    n = np.bincount(node_codes, minlength = n_nodes)
+    ape = np.bincount(node_codes, weights = np.abs(err) / np.maximum(np.abs(y), eps), minlength = n_nodes)
+    se = np.bincount(node_codes, weights = err * err, minlength = n_nodes)
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        return n, ape / n, np.sqrt(se / n)
+
+# function to fit on the training rows of a fold and evaluate on its test rows
+# X, y and node_codes are shared between folds, slices of them are views (no copies)
+def run_fold(X, y, node_codes, n_nodes, fold, params, n_jobs):
+    import xgboost as xgb
+
+    start, cut, end = fold
+    xgb_model = xgb.XGBRegressor(**params, n_jobs = n_jobs)
+    xgb_model.fit(X[start:cut], y[start:cut])
+    y_pred = xgb_model.predict(X[cut:end])
+
+    return node_errors(node_codes[cut:end], y[cut:end], y_pred, n_nodes)
+
+# function to backtest models of all targets with walk-forward folds evaluated in parallel threads
+# df needs Time and Node columns along with the predictors and targets
+def backtest(df, targets = targets, params = xgb_params, train_days = 14, test_days = 1,
+             window = 'expanding', max_workers = None, threads_per_fold = 1):
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_fold)
+
+    # sort by time once, so every fold is a contiguous slice
+    df = df.sort_values('Time', kind = 'stable')
+    predictors = [col for col in df.columns if col not in targets + ['Time', 'Node']]
+    node_codes_all, nodes = pd.factorize(df.Node, sort = True)
+
+    results = []
+    with ThreadPoolExecutor(max_workers = max_workers) as executor:
+        for target in targets:
+            # feature matrix of a target is built once and reused by all of its folds
+            valid = df[target].notna().to_numpy()
+            X = df.loc[valid, predictors].to_numpy(dtype = np.float32)
+            y = df.loc[valid, target].to_numpy(dtype = np.float64)
+            times = df.Time.to_numpy()[valid]
+            node_codes = node_codes_all[valid]
+
+            folds = rolling_folds(times, train_days, test_days, window)
+            futures = [executor.submit(run_fold, X, y, node_codes, len(nodes), fold, params, threads_per_fold)
+                       for fold in folds]
+
+            for i, (fold, future) in enumerate(zip(folds, futures)):
+                n, mape, rmse = future.result()
+                start, cut, end = fold
+                fdf = pd.DataFrame({'Target': target, 'Fold': i,
+                                    'TrainStart': times[start], 'TestStart': times[cut],
+                                    'TestEnd': times[end - 1], 'Node': nodes,
+                                    'N': n, 'MAPE': mape, 'RMSE': rmse})
+                results.append(fdf[fdf.N > 0])
+
+    # data shorter than train_days + test_days has no folds
+    if not results:
+        return pd.DataFrame(columns = result_cols)
+
+    return pd.concat(results, ignore_index = True)
+
+# =============================================================================
+# walk-forward backtest over January 2024 data
+# =============================================================================
+
+if __name__ == '__main__':
+    from model_registry import read_model_data, prepare_features
+
+    os.chdir(r"D:\GitHub\wireless_communication")
+
+    # read January 2024 data and prepare features as in feature_importance.py (keeping Node and Time)
+    df = prepare_features(read_model_data(months = ['2024-01']))
+
+    bdf = backtest(df, train_days = 14, test_days = 1)
+    bdf.to_csv("ignore/backtest_results.csv", index = False)
+    print(bdf.groupby(['Target', 'Fold'])[['MAPE', 'RMSE']].mean().round(2))
@@ -0,0 +1,202 @@
+import os
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+
+from radio_store import read_store
+from summary import summarize_metrics
+from heatmap_bins import binned_pivot
+from encom_logs import list_link_logs, read_link_logs
+from box_stats import box_plot
+from coverage import CoverageIndex, received
+from vendor_schema import source_columns, normalize, read_canonical
+
+# =============================================================================
+# before/after comparison engine driven by per-area configs
+# =============================================================================
+
+# month of before period in Parquet store
+before_months = ['2024-01']
+
+# display names of comparison metrics
+var_names = {'Upload': 'Upload Speed (Mbps)',
+             'Download': 'Download Speed (Mbps)',
+             'Latency': 'Latency (ms)',
+             'PacketLoss': 'Packet Loss (%)'}
+
+# per-area configs: node label of plots, metrics compared, and after-period source (None if not yet available)
+area_configs = {
+    'Kierland': {
+        'label': 'Nodes in Kierland Area',
+        'metrics': ['Upload', 'Download', 'Latency', 'PacketLoss'],
+        'after': {'reader': 'intuicom',
+                  'path': "ignore/data_after/kierland_intuicom_processed.txt",
+                  'end': '2025-03-18 23:00:00'} # exclude last date from analysis
+    },
+    'Thomas': {
+        'label': 'Nodes in Thomas West of I-17 Area',
+        'metrics': ['Tx Rate (Mbps)', 'Rx Rate (Mbps)'],
+        'after': {'reader': 'encom', 'area': 'Thomas',
+                  'folder': "ignore/data_after/Encom",
+                  'coverage': "ignore/data_after/encom_coverage.npz", # per-minute coverage of each link
+                  'metrics': ['Tx Rate (Mbps)', 'Rx Rate (Mbps)', 'Tx CCQ (%)', 'Rx CCQ (%)'],
+                  'name_map': {'59th Ave Osborn Remote': 'Osborn Rd & 59th Ave',
+                               '59th Ave Thomas NB Remote': 'Thomas Rd & 59th Ave',
+                               '59th Ave Indian School Master': 'Indian School Rd & 59th Ave'}}
+    },
+    'Southwest': {
+        'label': 'Nodes in SouthWest Area',
+        'metrics': ['Upload', 'Download', 'Latency', 'PacketLoss'],
+        'after': None
+    }
+}
+
+# function to read before data of all areas with one read of the Parquet store
+def load_before(areas = list(area_configs), months = before_months):
+    bdf = read_store(columns = ['Area', 'Node'] + source_columns('radio'), areas = areas, months = months)
+    bdf = normalize(bdf, 'radio')
+    bdf['Period'] = 'Before'
+
+    return bdf
+
+# =============================================================================
+# after-period readers
+# =============================================================================
+
+# function to read processed Intuicom data (already in canonical schema)
+def read_intuicom_after(config):
+    adf = read_canonical(config['path'])
+    if config.get('end') is not None:
+        adf = adf[adf.DateTime <= pd.Timestamp(config['end'])]
+
+    return adf
+
+# function to read Encom link logs aggregated to 1 min
+# minutes of each link with data are recorded in a coverage index (gaps are dropped below),
+# every link is expected from the first to the last minute of the logs
+def read_encom_after(config):
+    name_map = config['name_map']
+    adf = read_link_logs(list_link_logs(config['folder']), list(name_map), config['metrics'], name_map = name_map)
+    if config.get('coverage') is not None and len(adf):
+        links = list(name_map.values())
+        coverage = CoverageIndex('min').update(adf.Node, adf.DateTime, received(adf, config['metrics']))
+        coverage.expect(links, [adf.DateTime.min()] * len(links), [adf.DateTime.max()] * len(links))
+        coverage.save(config['coverage'])
+
+    return normalize(adf.dropna(), 'encom', area = config['area'])
+
+# readers of after-period sources (new vendors are added here)
+after_readers = {'intuicom': read_intuicom_after, 'encom': read_encom_after}
+
+# function to read after data of an area with the reader of its source
+def load_after(config):
+    if config['after'] is None:
+        return None
+    adf = after_readers[config['after']['reader']](config['after'])
+    adf['Period'] = 'After'
+
+    return adf
+
+# =============================================================================
+# comparisons
+# =============================================================================
+
+# function to combine before and after data of an area
+def combine_periods(bdf, adf, metrics):
+    cols = ['Node', 'DateTime', 'Period'] + metrics
+    if adf is None:
+        return bdf[cols].reset_index(drop = True)
+
+    return pd.concat([bdf[cols], adf[cols]], ignore_index = True)
+
+# function to load combined before and after data of one area
+def load_area(area, bdf = None):
+    config = area_configs[area]
+    if bdf is None:
+        bdf = load_before([area])
+    adf = load_after(config)
+
+    return combine_periods(bdf[bdf.Area == area], adf, config['metrics']), adf
+
+# function to compare metrics of an area by node and period in one grouped pass
+def compare_area(area, bdf):
+    config = area_configs[area]
+    adf = load_after(config)
+    xdf = combine_periods(bdf, adf, config['metrics'])
+    sdf = summarize_metrics(xdf, config['metrics'], by = ['Node', 'Period'], quantiles = (0.05, 0.95))
+    sdf.insert(0, 'Area', area)
+
+    return sdf
+
+# function to compare all areas concurrently (before data is read once and split by area)
+# must be called under if __name__ == '__main__' since it starts a process pool
+def compare_all(areas = list(area_configs), max_workers = None):
+    bdf = load_before(areas)
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        futures = {area: executor.submit(compare_area, area, bdf[bdf.Area == area]) for area in areas}
+        results = {area: future.result() for area, future in futures.items()}
+
+    return pd.concat(results.values(), ignore_index = True)
+
+# =============================================================================
+# figures
+# =============================================================================
+
+# function to create boxplot of a variable by node (and period or other color)
+# box statistics are computed here, only quartiles, whiskers and sampled outliers go to plotly
+def create_boxplot(xdf, variable, label, color = 'Period', legend_x = 0.9, labels = {}):
+    fig = box_plot(xdf, x = 'Node', y = variable, color = color,
+                   labels = {'Node': label, variable: var_names.get(variable, variable), **labels})
+    fig.update_layout(font = dict(size = 16),
+                      legend = dict(yanchor = 'top', y = 0.99, xanchor = 'left', x = legend_x, bgcolor='rgba(0,0,0,0)'),
+                      legend_title_text = '')
+
+    return fig
+
+# function to create heatmaps of node x datetime, one panel per (title, data, variable)
+def create_heatmap(panels, plot_title, zmin = None, zmax = None):
+    # bin DateTime to fit the plot width (mean per bin)
+    pivots = [binned_pivot(xdf, variable) for title, xdf, variable in panels]
+
+    # create subplot layout
+    fig = make_subplots(
+        rows = len(panels), cols = 1,
+        shared_xaxes = False, shared_yaxes = False,
+        subplot_titles = [title for title, xdf, variable in panels]
+    )
+
+    for i, pivot in enumerate(pivots):
+        last = i == len(pivots) - 1
+        fig.add_trace(go.Heatmap(
+            z = pivot.values,
+            x = pivot.columns,
+            y = pivot.index,
+            zmin = zmin, zmax = zmax,
+            colorscale = 'Viridis',
+            showscale = last,
+            colorbar = dict(
+                title = plot_title,
+                orientation = 'h', x = 0.5, xanchor = 'center', y = 0.45, yanchor = 'bottom',
+                thickness = 15, len = 0.5
+            ) if last else None
+        ), row = i + 1, col = 1)
+
+    # layout
+    fig.update_layout(
+        height = 750, font = dict(size = 16), title = ''
+    )
+
+    return fig
+
+# =============================================================================
+# compare all areas in one run
+# =============================================================================
+
+if __name__ == '__main__':
+    os.chdir(r"/Users/prameshpudasaini/Library/CloudStorage/OneDrive-UniversityofArizona/GitHub/wireless_communication")
+
+    cdf = compare_all()
+    cdf.to_csv("ignore/before_after_summary.csv", index = False)
+    print(cdf)
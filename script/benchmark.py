@@ -0,0 +1,155 @@
+import os
+import sys
+import time
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+
+from synthetic_data import processed_frame, write_radio_folder, write_encom_logs, node_names
+from instrument import records
+
+# =============================================================================
+# throughput benchmarks of the pipeline stages on synthetic data
+# =============================================================================
+
+# base workload: one node with 31 days of hourly data (scales multiply the number of nodes)
+base_nodes = 1
+base_days = 31
+
+# scale factors (multiples of the base number of nodes)
+scales = {'1x': 1, '10x': 10, '100x': 100, '1000x': 1000}
+
+# default file of benchmark results (one row per run, scale and stage)
+results_path = "ignore/benchmark_results.csv"
+
+# metrics of the analysis stages
+perf_metrics = ['Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)', 'Packet Loss']
+metrics_all = perf_metrics + ['2.4 GHz Noise', '5.8 GHz Noise', 'Tx Rate (Kbps)', 'Rx Rate (Kbps)',
+                              '2.4 GHz Airtime Total', '5.8 GHz Airtime Total', '2.4 GHz Routed Clients', 'Hop Count']
+
+# function to time one call, returns seconds and the result
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+
+    return time.perf_counter() - start, result
+
+# =============================================================================
+# stages (each takes the workload and returns the number of rows processed and seconds)
+# =============================================================================
+
+# ingest: parallel read and processing of a radio export folder of csv files
+def bench_ingest(n_nodes, tmp_dir):
+    from ingest import update_processed
+
+    folder = write_radio_folder(tmp_dir, n_nodes, base_days)
+    seconds, (df, _) = timed(update_processed, [folder], os.path.join(tmp_dir, 'processed'))
+
+    return len(df), seconds
+
+# encom: streaming aggregation of per-second link logs to 1-min means (one hour, one link per 10 nodes)
+def bench_encom(n_nodes, tmp_dir):
+    from encom_logs import list_link_logs, read_link_logs
+
+    nodes = node_names(max(1, n_nodes // 10))
+    folder = os.path.join(tmp_dir, 'Encom')
+    write_encom_logs(folder, nodes, hours = 1)
+    paths = list_link_logs(folder)
+    seconds, adf = timed(read_link_logs, paths, nodes)
+
+    return len(nodes) * 3600, seconds
+
+# summary: single-pass summary statistics by area and node
+def bench_summary(df):
+    from summary import summarize_metrics
+
+    seconds, sdf = timed(summarize_metrics, df, metrics_all, quantiles = (0.05, 0.95, 0.99))
+
+    return len(df), seconds
+
+# correlation: running correlation cube by area, node and month
+def bench_correlation(df):
+    from correlation import CorrelationCube
+
+    seconds, cube = timed(lambda: CorrelationCube(metrics_all).update(df).corr())
+
+    return len(df), seconds
+
+# anomaly: Isolation Forest fit and prediction on the performance metrics
+def bench_anomaly(df):
+    from sklearn.ensemble import IsolationForest
+
+    X = df[perf_metrics].dropna()
+    model = IsolationForest(contamination = 0.01, random_state = 42)
+    seconds, labels = timed(lambda: model.fit(X).predict(X))
+
+    return len(X), seconds
+
+# model: XGBoost training of one target (registry in the temporary folder, always retrained)
+def bench_model(df, tmp_dir):
+    from calendar_index import CalendarIndex
+    from model_registry import prepare_features, train_model, xgb_params
+
+    xdf = df[['Area', 'Time'] + metrics_all]
+    xdf.insert(2, 'Peak', CalendarIndex.covering(xdf.Time).peak(xdf.Time))
+    xdf = prepare_features(xdf.drop(columns = 'Time'))
+    predictors = [col for col in xdf.columns if col not in perf_metrics]
+    seconds, entry = timed(train_model, xdf, perf_metrics[0], predictors, xgb_params,
+                           os.path.join(tmp_dir, 'registry'), force = True)
+
+    return entry['n_rows'], seconds
+
+# stages that work on files and stages that work on the in-memory dataset
+file_stages = {'ingest': bench_ingest, 'encom': bench_encom}
+frame_stages = {'summary': bench_summary, 'correlation': bench_correlation,
+                'anomaly': bench_anomaly, 'model': bench_model}
+
+# function to run the selected stages at each scale and return one row per scale and stage
+def run_benchmarks(selected_scales = ['10x', '100x', '1000x'], stages = list(file_stages) + list(frame_stages)):
+    rows = []
+    for scale in selected_scales:
+        n_nodes = base_nodes * scales[scale]
+        df = None
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for stage in stages:
+                if stage in file_stages:
+                    n_rows, seconds = file_stages[stage](n_nodes, tmp_dir)
+                else:
+                    if df is None:
+                        df = processed_frame(n_nodes, base_days)
+                    args = (df, tmp_dir) if stage == 'model' else (df,)
+                    n_rows, seconds = frame_stages[stage](*args)
+
+                row = {'Scale': scale, 'Nodes': n_nodes, 'Stage': stage, 'Rows': n_rows,
+                       'Seconds': round(seconds, 3), 'RowsPerSecond': round(n_rows / seconds) if seconds > 0 else np.nan}
+                print(row)
+                rows.append(row)
+
+                # stage records of the pipeline code are not kept (timings are measured here)
+                records.clear()
+
+    return pd.DataFrame(rows)
+
+# function to append results to the results file with run time and Python/pandas versions
+def save_results(rdf, results_path = results_path):
+    rdf = rdf.assign(RunTime = pd.Timestamp.now().floor('s'),
+                     Python = sys.version.split()[0], Pandas = pd.__version__)
+    os.makedirs(os.path.dirname(results_path) or '.', exist_ok = True)
+    rdf.to_csv(results_path, mode = 'a', header = not os.path.exists(results_path), index = False)
+
+# =============================================================================
+# run benchmarks, e.g. python script/benchmark.py --scales 10x 100x --stages ingest summary
+# =============================================================================
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Benchmark pipeline stages on synthetic radio data')
+    parser.add_argument('--scales', nargs = '+', default = ['10x', '100x', '1000x'], choices = list(scales))
+    parser.add_argument('--stages', nargs = '+', default = list(file_stages) + list(frame_stages),
+                        choices = list(file_stages) + list(frame_stages))
+    parser.add_argument('--output', default = results_path)
+    args = parser.parse_args()
+
+    rdf = run_benchmarks(args.scales, args.stages)
+    save_results(rdf, args.output)
+    print(rdf.to_string(index = False))
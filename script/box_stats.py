@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+# =============================================================================
+# precomputed box-plot statistics and figures built from them
+# =============================================================================
+
+# default maximum number of outliers drawn per box
+default_max_outliers = 200
+
+# function to compute quartiles, whiskers (1.5 IQR) and a capped sample of outliers per group
+def box_stats(xdf, x, y, color = None, max_outliers = default_max_outliers, seed = 42):
+    keys = [x] if color is None else [x, color]
+    v = xdf[keys + [y]].dropna(subset = [y])
+
+    grouped = v.groupby(keys, observed = True, sort = True)
+    codes = grouped.ngroup().to_numpy()
+    values = v[y].to_numpy(dtype = float)
+
+    # quartiles of all groups with one grouped quantile
+    stats = grouped[y].quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ['q1', 'median', 'q3']
+    stats['mean'] = grouped[y].mean()
+    stats['count'] = grouped[y].size()
+
+    # whiskers end at the most extreme values within 1.5 IQR of the box
+    iqr = (stats.q3 - stats.q1).to_numpy()
+    lo = (stats.q1.to_numpy() - 1.5 * iqr)[codes]
+    hi = (stats.q3.to_numpy() + 1.5 * iqr)[codes]
+    inside = (values >= lo) & (values <= hi)
+    within = pd.Series(np.where(inside, values, np.nan))
+    stats['lowerfence'] = within.groupby(codes).min().to_numpy()
+    stats['upperfence'] = within.groupby(codes).max().to_numpy()
+
+    # random sample of at most max_outliers outliers per group
+    outliers = v[~inside].sample(frac = 1, random_state = seed)
+    outliers = outliers.groupby(keys, observed = True).head(max_outliers)
+
+    return stats.reset_index(), outliers
+
+# function to build box plot from precomputed statistics (same arguments as px.box)
+def box_plot(xdf, x, y, color = None, category_orders = {}, labels = {},
+             max_outliers = default_max_outliers):
+    stats, outliers = box_stats(xdf, x, y, color, max_outliers)
+
+    # one box trace (and outlier trace) per color group, in the given order
+    if color is None:
+        groups = [(None, stats, outliers)]
+    else:
+        order = list(category_orders.get(color, []))
+        values = order + [c for c in stats[color].unique() if c not in order]
+        groups = [(c, stats[stats[color] == c], outliers[outliers[color] == c])
+                  for c in values if (stats[color] == c).any()]
+
+    palette = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (name, s, o) in enumerate(groups):
+        group = str(name)
+        marker = dict(color = palette[i % len(palette)])
+        fig.add_trace(go.Box(
+            x = s[x], q1 = s.q1, median = s['median'], q3 = s.q3, mean = s['mean'],
+            lowerfence = s.lowerfence, upperfence = s.upperfence,
+            name = group, legendgroup = group, offsetgroup = group,
+            marker = marker, showlegend = name is not None, boxpoints = False
+        ))
+        fig.add_trace(go.Scatter(
+            x = o[x], y = o[y], mode = 'markers', name = group, legendgroup = group,
+            offsetgroup = group, marker = dict(marker, size = 4), showlegend = False
+        ))
+
+    fig.update_layout(
+        boxmode = 'group', scattermode = 'group',
+        xaxis_title = labels.get(x, x), yaxis_title = labels.get(y, y),
+        legend_title_text = labels.get(color, color) if color is not None else None
+    )
+    if x in category_orders:
+        fig.update_xaxes(categoryorder = 'array', categoryarray = list(category_orders[x]))
+
+    return fig
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+
+# =============================================================================
+# hourly calendar feature index (peak, day of week, holiday flags)
+# =============================================================================
+
+# peak periods and the peak code of each hour of day
+# Morning 6-10, Mid-day 10-15, Evening 15-19, Night 19-6
+peak_names = ['Morning', 'Mid-day', 'Evening', 'Night']
+hour_peak = np.array([3] * 6 + [0] * 4 + [1] * 5 + [2] * 4 + [3] * 5, dtype = np.int8)
+
+# day names in day-of-week order (Monday = 0)
+day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# holiday months (December due to holidays)
+holiday_months = [12]
+
+class CalendarIndex:
+    # one row of integer-coded features per hour from start to end
+    # rows are looked up by integer hour offset from start, so joins are a gather instead of a merge
+    def __init__(self, start, end):
+        self.start = pd.Timestamp(start).floor('h')
+        hours = pd.date_range(self.start, pd.Timestamp(end).floor('h'), freq = 'h')
+        dates = hours.normalize()
+        holidays = USFederalHolidayCalendar().holidays(dates.min(), dates.max())
+
+        self.features = pd.DataFrame({
+            'Hour': hours.hour.to_numpy(np.int8),
+            'Peak': hour_peak[hours.hour],
+            'DayOfWeek': hours.dayofweek.to_numpy(np.int8),
+            'Month': hours.month.to_numpy(np.int8),
+            'IsWeekend': hours.dayofweek.to_numpy() >= 5,
+            'IsHoliday': dates.isin(holidays),
+            'IsHolidayMonth': np.isin(hours.month, holiday_months)
+        }, index = hours)
+
+    # calendar covering all (non-missing) times
+    @classmethod
+    def covering(cls, times):
+        times = pd.DatetimeIndex(times).dropna()
+        if len(times) == 0:
+            return cls('1970-01-01', '1970-01-01')
+
+        return cls(times.min(), times.max())
+
+    # row of every time in the index (-1 for missing times or times outside the calendar)
+    def positions(self, times):
+        t = np.asarray(times, dtype = 'datetime64[ns]')
+        pos = (t.view(np.int64) - self.start.value) // (3600 * 10**9)
+        valid = ~np.isnat(t) & (pos >= 0) & (pos < len(self.features))
+
+        return np.where(valid, pos, -1)
+
+    # values of a calendar feature for every time (-1 or False where the time is not covered)
+    def gather(self, times, column):
+        values = self.features[column].to_numpy()
+        pos = self.positions(times)
+        fill = False if values.dtype == bool else -1
+
+        return np.where(pos >= 0, values[np.maximum(pos, 0)], fill).astype(values.dtype)
+
+    # peak period of every time as categorical (codes gathered from the index)
+    def peak(self, times):
+        return pd.Categorical.from_codes(self.gather(times, 'Peak'), peak_names)
+
+    # day name of every time as categorical
+    def day(self, times):
+        return pd.Categorical.from_codes(self.gather(times, 'DayOfWeek'), day_names)
+
+    # whether each time has any of the given flags (e.g. ['IsHolidayMonth', 'IsHoliday'])
+    def flagged(self, times, flags):
+        result = np.zeros(len(times), dtype = bool)
+        for flag in flags:
+            result |= self.gather(times, flag)
+
+        return result
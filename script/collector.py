@@ -0,0 +1,276 @@
+import os
+import json
+import time
+import random
+import asyncio
+import argparse
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+
+from ingest import cols, area_of, exclude_flags
+from calendar_index import CalendarIndex
+from coverage import CoverageIndex, received
+from radio_store import store_path, cols_float, write_store, read_store, compact_partitions
+from instrument import stage, save_run_log
+
+# aiohttp is only needed by the collector and the stand-in server
+try:
+    import aiohttp
+    from aiohttp import web
+except ImportError:
+    aiohttp = None
+
+# =============================================================================
+# asyncio collector polling radio management endpoints into the Parquet store
+# =============================================================================
+
+# default file of polled nodes (JSON object of node name -> metrics URL)
+nodes_path = "ignore/collector_nodes.json"
+
+# polling: seconds between rounds, concurrent requests and request timeout (seconds)
+poll_interval = 300
+max_concurrency = 50
+request_timeout = 10
+
+# backoff of failing nodes: first delay, longest delay (seconds)
+backoff_base = 30
+backoff_max = 3600
+
+# batched appends: rows buffered before a write, longest time between writes (seconds)
+batch_rows = 5000
+flush_interval = 900
+
+# function to check a payload of an endpoint (one record or a list of records)
+# returns the records with their times, raises ValueError on malformed records
+def parse_payload(payload):
+    records = payload if isinstance(payload, list) else [payload]
+    times = []
+    for rec in records:
+        if not isinstance(rec, dict) or 'Time' not in rec:
+            raise ValueError("Record without Time")
+        t = pd.Timestamp(rec['Time'])
+        if pd.isna(t):
+            raise ValueError("Record with missing Time")
+        for col in cols_float:
+            if rec.get(col) is not None and not isinstance(rec[col], (int, float)):
+                raise ValueError(f"Record with non-numeric {col}")
+        times.append(t)
+
+    return records, times
+
+# function to get the latest stored time of nodes (nodes without data are left out)
+def stored_last_times(root, nodes):
+    if not os.path.exists(root):
+        return {}
+    sdf = read_store(root, columns = ['Node', 'Time'], nodes = nodes)
+
+    return sdf.groupby('Node').Time.max().to_dict()
+
+# function to convert polled records (dicts with the columns of ingest.cols) to processed rows
+# hours flagged in the calendar are dropped as in ingest.process_node_data
+def records_frame(records):
+    data = pd.DataFrame.from_records(records, columns = cols + ['Node'])
+    data['Time'] = pd.to_datetime(data.Time)
+    keep = ~CalendarIndex.covering(data.Time).flagged(data.Time, exclude_flags)
+    data = data[keep].reset_index(drop = True)
+    data['Area'] = area_of(data.Node)
+
+    return data
+
+class Collector:
+    # nodes: dict of node name -> URL of its metrics endpoint (returns one record or a list of records)
+    # each node keeps its own backoff state: consecutive failures and the time of the next attempt
+    # last_time keeps the latest stored time of each node so repeated polls of the same hour are skipped
+    # (read from the store at start, so a restarted collector does not store an hour twice)
+    # hourly coverage of the polled nodes is kept next to the store (<root>.coverage.npz, see coverage.py),
+    # every polled node is expected in each hour the collector runs
+    def __init__(self, nodes, root = store_path, interval = poll_interval, concurrency = max_concurrency,
+                 timeout = request_timeout, batch = batch_rows, flush_every = flush_interval,
+                 coverage_path = None, seed = None):
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the collector (pip install aiohttp)")
+        self.nodes = dict(nodes)
+        self.root = root
+        self.interval = interval
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.batch = batch
+        self.flush_every = flush_every
+        self.coverage_path = root + '.coverage.npz' if coverage_path is None else coverage_path
+        self.coverage = CoverageIndex.load_or_create(self.coverage_path, 'h', exclude_flags)
+        self.expect_from = pd.Timestamp.now().floor('h')
+
+        self.failures = dict.fromkeys(self.nodes, 0)
+        self.retry_at = dict.fromkeys(self.nodes, 0.0)
+        self.last_time = stored_last_times(root, list(self.nodes))
+        self.month = None
+        self.buffer = []
+        self.flushed_at = time.monotonic()
+        self.stats = {'polled': 0, 'failed': 0, 'skipped': 0, 'rows': 0, 'written': 0}
+        self.rng = random.Random(seed)
+
+    # delay before the next attempt after n consecutive failures (exponential with jitter)
+    def backoff(self, n):
+        return min(backoff_base * 2 ** (n - 1), backoff_max) * self.rng.uniform(0.5, 1)
+
+    # poll one node, records newer than its last stored time are added to the buffer
+    # failed requests and malformed payloads count as failures and back off the node
+    async def poll_node(self, session, semaphore, node):
+        now = time.monotonic()
+        if now < self.retry_at[node]:
+            self.stats['skipped'] += 1
+            return
+
+        try:
+            async with semaphore:
+                async with session.get(self.nodes[node]) as resp:
+                    resp.raise_for_status()
+                    payload = await resp.json(content_type = None)
+            records, times = parse_payload(payload)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError, TypeError):
+            self.failures[node] += 1
+            self.retry_at[node] = now + self.backoff(self.failures[node])
+            self.stats['failed'] += 1
+            return
+
+        self.failures[node] = 0
+        self.retry_at[node] = 0.0
+        self.stats['polled'] += 1
+
+        last = self.last_time.get(node)
+        for rec, t in zip(records, times):
+            if last is None or t > last:
+                self.buffer.append({**rec, 'Node': node})
+                self.last_time[node] = last = t
+
+    # poll all nodes once (at most concurrency requests in flight)
+    async def poll_round(self, session):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*(self.poll_node(session, semaphore, node) for node in self.nodes))
+
+    # append buffered records to the store as one batch
+    # appended files of each partition are merged into one when a new month starts
+    def flush(self):
+        records, self.buffer = self.buffer, []
+        self.flushed_at = time.monotonic()
+
+        # hours polled since the last flush
+        now = pd.Timestamp.now().floor('h')
+        nodes = list(self.nodes)
+        self.coverage.expect(nodes, [self.expect_from] * len(nodes), [now] * len(nodes))
+        self.expect_from = now
+        if not records:
+            self.coverage.save(self.coverage_path)
+            return
+
+        with stage('collector_flush', rows = len(records)):
+            data = records_frame(records)
+            if len(data):
+                write_store(data, self.root, overwrite = False, append = True)
+                self.coverage.update(data.Node, data.Time, received(data))
+            self.coverage.save(self.coverage_path)
+        self.stats['rows'] += len(data)
+        self.stats['written'] += 1
+
+        month = data.Time.max().strftime('%Y-%m') if len(data) else self.month
+        if self.month is not None and month != self.month:
+            with stage('collector_compact'):
+                compact_partitions(self.root)
+            save_run_log('collector')
+        self.month = month
+
+    # poll every interval seconds (forever, or for a number of rounds), flush in a worker thread
+    async def run(self, rounds = None):
+        # one pooled session: keep-alive connections are reused across rounds
+        connector = aiohttp.TCPConnector(limit = self.concurrency)
+        timeout = aiohttp.ClientTimeout(total = self.timeout)
+        async with aiohttp.ClientSession(connector = connector, timeout = timeout) as session:
+            n = 0
+            try:
+                while rounds is None or n < rounds:
+                    started = time.monotonic()
+                    await self.poll_round(session)
+                    n += 1
+                    if len(self.buffer) >= self.batch or started - self.flushed_at >= self.flush_every:
+                        await asyncio.to_thread(self.flush)
+                    print(f"Round {n}: {self.stats} ({time.monotonic() - started:.2f} s)")
+                    if rounds is None or n < rounds:
+                        await asyncio.sleep(max(0, self.interval - (time.monotonic() - started)))
+            finally:
+                await asyncio.to_thread(self.flush)
+                save_run_log('collector')
+
+        return self.stats
+
+# function to read the polled nodes (JSON object of node name -> metrics URL)
+def read_nodes(path = nodes_path):
+    with open(path) as f:
+        return json.load(f)
+
+# =============================================================================
+# local stand-in of the management endpoints (for testing the collector)
+# =============================================================================
+
+# function to build a stand-in app serving synthetic metrics of the current hour at /nodes/{node}/metrics
+# a share of requests (failure_rate) fails with 503 to exercise the backoff
+def stand_in_app(failure_rate = 0.0, seed = 42):
+    from synthetic_data import radio_metrics
+
+    rng = np.random.default_rng(seed)
+
+    async def metrics(request):
+        if rng.random() < failure_rate:
+            raise web.HTTPServiceUnavailable()
+        times = pd.DatetimeIndex([pd.Timestamp.now().floor('h')])
+        rec = radio_metrics(times, rng).iloc[0]
+        payload = {col: (None if pd.isna(rec[col]) else rec[col]) for col in cols}
+        payload['Time'] = rec['Time'].isoformat()
+
+        return web.json_response(payload, dumps = lambda obj: json.dumps(obj, default = float))
+
+    app = web.Application()
+    app.router.add_get('/nodes/{node}/metrics', metrics)
+
+    return app
+
+# function to start the stand-in server in the running event loop, returns its runner (call cleanup to stop)
+async def start_stand_in(host = '127.0.0.1', port = 8080, failure_rate = 0.0, seed = 42):
+    runner = web.AppRunner(stand_in_app(failure_rate, seed))
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+
+    return runner
+
+# function to build stand-in URLs of node names
+def stand_in_nodes(names, host = '127.0.0.1', port = 8080):
+    return {name: f"http://{host}:{port}/nodes/{quote(name, safe = '')}/metrics"
+            for name in names}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Poll radio management endpoints into the Parquet store')
+    parser.add_argument('--nodes', default = nodes_path)
+    parser.add_argument('--store', default = store_path)
+    parser.add_argument('--interval', type = float, default = poll_interval)
+    parser.add_argument('--rounds', type = int, default = None)
+    parser.add_argument('--concurrency', type = int, default = max_concurrency)
+    parser.add_argument('--stand-in', type = int, default = 0, metavar = 'N',
+                        help = 'poll N synthetic nodes of a local stand-in server instead of --nodes')
+    args = parser.parse_args()
+
+    async def main():
+        runner = None
+        if args.stand_in:
+            from synthetic_data import node_names
+            runner = await start_stand_in()
+            nodes = stand_in_nodes(node_names(args.stand_in))
+        else:
+            nodes = read_nodes(args.nodes)
+        try:
+            collector = Collector(nodes, args.store, interval = args.interval, concurrency = args.concurrency)
+            await collector.run(args.rounds)
+        finally:
+            if runner is not None:
+                await runner.cleanup()
+
+    asyncio.run(main())
@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+from ingest import cols
+
+# =============================================================================
+# memory-compact dtypes of the processed radio dataset
+# =============================================================================
+
+# string dimensions stored as categoricals
+cols_category = ['Area', 'Node', 'YearMonth', 'Peak', 'Day',
+                 '2.4 GHz Channel', '5.8 GHz Channel', 'Next Hop Upstream Router']
+
+# fixed dtypes of radio metrics, the same for every read so frames of different months concatenate
+# without upcasting (float32 keeps missing values as nan, integer metrics such as noise and counts are exact)
+cols_dtype = {col: np.float32 for col in cols if col != 'Time' and col not in cols_category}
+
+# function to convert a dataframe to compact dtypes (string dimensions to categoricals, metrics to cols_dtype)
+# the result is a new frame, so callers should rebind (df = compact_frame(df)) to free the original
+def compact_frame(df, categories = cols_category):
+    data = {}
+    for col in df.columns:
+        values = df[col]
+        if col in categories or values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                data[col] = values.cat.remove_unused_categories()
+            else:
+                data[col] = values.astype('category')
+        elif pd.api.types.is_bool_dtype(values.dtype) or pd.api.types.is_datetime64_any_dtype(values.dtype):
+            data[col] = values
+        elif col in cols_dtype:
+            data[col] = values.astype(cols_dtype[col])
+        else:
+            data[col] = values
+
+    return pd.DataFrame(data, index = df.index)
+
+# function to report memory use of a dataframe by column (MB)
+def memory_report(df):
+    usage = df.memory_usage(index = False, deep = True) / 1e6
+
+    return pd.DataFrame({'dtype': df.dtypes.astype(str), 'MB': usage.round(2)})
@@ -0,0 +1,90 @@
+import json
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# correlation cube of running sufficient statistics per Area/Node/month
+# =============================================================================
+
+class CorrelationCube:
+    # each cell (Area, Node, YearMonth) keeps k x k matrices over rows where both metrics are present:
+    # N (count), Sx (sum of row metric), Sxx (sum of squares of row metric), Sxy (sum of cross-products)
+    def __init__(self, metrics, by = ['Area', 'Node', 'YearMonth']):
+        self.metrics = list(metrics)
+        self.by = list(by)
+        k = len(self.metrics)
+
+        self.keys = pd.DataFrame(columns = self.by)
+        self.stats = {name: np.zeros((0, k, k)) for name in ['N', 'Sx', 'Sxx', 'Sxy']}
+
+    # add rows (e.g. new hourly data) to the running statistics
+    def update(self, df):
+        if 'YearMonth' in self.by and 'YearMonth' not in df.columns:
+            df = df.assign(YearMonth = df.Time.dt.strftime('%Y-%m'))
+
+        values = df[self.metrics].to_numpy(dtype = float)
+        valid = ~np.isnan(values)
+        mask = valid.astype(float)
+        z = np.where(valid, values, 0.0)
+
+        # cell index of every row, new cells are appended to the cube
+        cells = pd.MultiIndex.from_frame(df[self.by].astype(str))
+        known = pd.MultiIndex.from_frame(self.keys[self.by].astype(str)) if len(self.keys) else None
+        new_keys = cells.unique() if known is None else cells.unique().difference(known)
+        if len(new_keys):
+            self.keys = pd.concat([self.keys, new_keys.to_frame(index = False)], ignore_index = True)
+            k = len(self.metrics)
+            for name in self.stats:
+                self.stats[name] = np.concatenate([self.stats[name], np.zeros((len(new_keys), k, k))])
+        index = pd.MultiIndex.from_frame(self.keys[self.by].astype(str)).get_indexer(cells)
+
+        # sums of each cell from matrix products over its rows
+        order = np.argsort(index, kind = 'stable')
+        bounds = np.flatnonzero(np.diff(index[order])) + 1
+        for rows in np.split(order, bounds):
+            cell = index[rows[0]]
+            m, zr = mask[rows], z[rows]
+            self.stats['N'][cell] += m.T @ m
+            self.stats['Sx'][cell] += zr.T @ m
+            self.stats['Sxx'][cell] += (zr * zr).T @ m
+            self.stats['Sxy'][cell] += zr.T @ zr
+
+        return self
+
+    # boolean selection of cells, e.g. select(Area = ['Kierland'], YearMonth = ['2024-01'])
+    def select(self, **filters):
+        keep = np.ones(len(self.keys), dtype = bool)
+        for col, values in filters.items():
+            if values is not None:
+                keep &= self.keys[col].astype(str).isin([str(v) for v in values]).to_numpy()
+
+        return keep
+
+    # correlation matrix of selected cells (pairwise complete, same as DataFrame.corr)
+    def corr(self, **filters):
+        keep = self.select(**filters)
+        n, sx, sxx, sxy = (self.stats[name][keep].sum(axis = 0) for name in ['N', 'Sx', 'Sxx', 'Sxy'])
+
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            cov = n * sxy - sx * sx.T
+            var = n * sxx - sx * sx
+            corr = cov / np.sqrt(var * var.T)
+        corr[n < 2] = np.nan
+        corr = np.clip(corr, -1, 1)
+
+        return pd.DataFrame(corr, index = self.metrics, columns = self.metrics)
+
+    # save statistics to a compressed NumPy file
+    def save(self, path):
+        np.savez_compressed(path, metrics = json.dumps(self.metrics), by = json.dumps(self.by),
+                            keys = self.keys.astype(str).to_numpy(dtype = str), **self.stats)
+
+    # load statistics saved with save
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle = False)
+        cube = cls(json.loads(str(data['metrics'])), json.loads(str(data['by'])))
+        cube.keys = pd.DataFrame(data['keys'], columns = cube.by)
+        cube.stats = {name: data[name] for name in cube.stats}
+
+        return cube
@@ -0,0 +1,199 @@
+import os
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from calendar_index import CalendarIndex
+
+# =============================================================================
+# per-node data availability: bitmaps of expected and received samples and gap queries
+# =============================================================================
+
+# metrics of a radio row that count it as received (rows with all of them missing are gaps)
+received_cols = ['Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)', 'Packet Loss']
+
+# function to flag received rows of a frame (any of the metrics present)
+def received(df, metrics = received_cols):
+    return df[[col for col in metrics if col in df.columns]].notna().any(axis = 1).to_numpy()
+
+class CoverageIndex:
+    # two bits per node and slot (hourly for radio data, per minute for Encom link logs), slot 0 starts at origin:
+    #   span[i, s] = node i is expected in slot s (windows of ingested files, polling periods, see expect)
+    #   bits[i, s] = node i reported in slot s (see update)
+    # slots flagged in the calendar (exclude_flags, e.g. hours dropped at ingest) are never expected
+    def __init__(self, freq = 'h', exclude_flags = []):
+        self.freq = freq
+        self.step = to_offset(freq).nanos
+        self.exclude_flags = list(exclude_flags)
+        self.origin = None
+        self.nodes = pd.Index([], dtype = object)
+        self.bits = np.zeros((0, 0), dtype = bool)
+        self.span = np.zeros((0, 0), dtype = bool)
+        self.n_slots = 0
+
+    # slot of timestamps (relative to origin)
+    def slot_of(self, times):
+        t = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(times)))
+
+        return (t.asi8 - self.origin.value) // self.step
+
+    # start time of slots
+    def time_of(self, slots):
+        return self.origin + pd.to_timedelta(np.asarray(slots) * self.step, unit = 'ns')
+
+    # grow the bitmaps to hold n_nodes rows and slots lo to hi (lo < 0 moves the origin back)
+    def grow(self, n_nodes, lo, hi):
+        shift = max(-lo, 0)
+        n_slots = max(self.n_slots, hi) + shift
+        rows, capacity = self.bits.shape
+        if n_nodes > rows or n_slots > capacity or shift:
+            # spare capacity so appending recent slots does not copy the bitmaps every time
+            if n_slots > capacity and not shift:
+                capacity = max(n_slots, 2 * capacity)
+            shape = (max(n_nodes, rows), max(n_slots, capacity))
+            for name in ['bits', 'span']:
+                grown = np.zeros(shape, dtype = bool)
+                grown[:rows, shift:shift + self.n_slots] = getattr(self, name)[:, :self.n_slots]
+                setattr(self, name, grown)
+        if shift:
+            self.origin -= pd.Timedelta(shift * self.step, unit = 'ns')
+        self.n_slots = n_slots
+
+    # rows and slots of nodes and times, new nodes are added and the bitmaps grown to hold the times
+    def locate(self, nodes, times):
+        if self.origin is None:
+            self.origin = pd.Timestamp(times.min()).floor(self.freq)
+        self.nodes = self.nodes.append(pd.Index(pd.unique(nodes)).difference(self.nodes))
+        slot = self.slot_of(times)
+        self.grow(len(self.nodes), slot.min(), slot.max() + 1)
+
+        return self.nodes.get_indexer(nodes), self.slot_of(times)
+
+    # set bits of received samples (nodes and times of rows, received flags rows that count)
+    def update(self, nodes, times, received = None):
+        t = pd.to_datetime(pd.Series(np.asarray(times))).to_numpy('datetime64[ns]')
+        keep = ~np.isnat(t) if received is None else ~np.isnat(t) & np.asarray(received, dtype = bool)
+        nodes, t = np.asarray(nodes, dtype = str)[keep], t[keep]
+        if len(t):
+            i, slot = self.locate(nodes, t)
+            self.bits[i, slot] = True
+
+        return self
+
+    # mark windows in which nodes are expected to report (start and end times inclusive)
+    def expect(self, nodes, starts, ends):
+        nodes = np.asarray(nodes, dtype = str)
+        if len(nodes):
+            times = pd.to_datetime(pd.Series(np.concatenate([np.asarray(starts), np.asarray(ends)])))
+            i, slot = self.locate(np.concatenate([nodes, nodes]), times.to_numpy('datetime64[ns]'))
+            for row, lo, hi in zip(i[:len(nodes)], slot[:len(nodes)], slot[len(nodes):]):
+                self.span[row, lo:hi + 1] = True
+
+        return self
+
+    # clear a window of a node (e.g. of a re-exported or removed file): it is neither expected nor received
+    def clear(self, node, start, end):
+        if node in self.nodes and self.origin is not None:
+            lo, hi = self.slot_of([pd.Timestamp(start), pd.Timestamp(end)])
+            row = self.nodes.get_loc(node)
+            self.bits[row, max(lo, 0):max(hi + 1, 0)] = False
+            self.span[row, max(lo, 0):max(hi + 1, 0)] = False
+
+    # slot range of a time window (default: whole index), end is exclusive
+    def window(self, start = None, end = None):
+        lo = 0 if start is None else int(np.clip(self.slot_of(start)[0], 0, self.n_slots))
+        hi = self.n_slots if end is None else int(np.clip(self.slot_of(end)[0], 0, self.n_slots))
+
+        return lo, max(hi, lo)
+
+    # expected slots of nodes in a slot range (in their windows, not flagged in the calendar)
+    def expected(self, lo, hi, rows = slice(None)):
+        expected = self.span[rows, lo:hi]
+        if self.exclude_flags and hi > lo:
+            times = self.time_of(np.arange(lo, hi))
+            expected = expected & ~CalendarIndex.covering(times).flagged(times, self.exclude_flags)
+
+        return expected
+
+    # row positions of nodes (default: all nodes)
+    def rows(self, nodes = None):
+        if nodes is None:
+            return np.arange(len(self.nodes))
+        rows = self.nodes.get_indexer(list(nodes))
+        if (rows < 0).any():
+            raise KeyError(f"Nodes not in coverage index: {list(np.array(list(nodes))[rows < 0])}")
+
+        return rows
+
+    # expected and received slots and coverage (%) of each node in a time window
+    def coverage(self, start = None, end = None, nodes = None):
+        rows = self.rows(nodes)
+        lo, hi = self.window(start, end)
+        expected = self.expected(lo, hi, rows)
+        n_expected = expected.sum(axis = 1)
+        n_received = (self.bits[rows, lo:hi] & expected).sum(axis = 1)
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            pct = np.round(n_received / n_expected * 100, 1)
+
+        return pd.DataFrame({'Node': self.nodes[rows], 'Expected': n_expected, 'Received': n_received,
+                             'Coverage (%)': pct})
+
+    # gaps (runs of expected slots without data) of each node in a time window
+    # returns Node, Start, End (exclusive) and Slots, gaps shorter than min_slots are left out
+    def gaps(self, start = None, end = None, nodes = None, min_slots = 1):
+        rows = self.rows(nodes)
+        lo, hi = self.window(start, end)
+        missing = self.expected(lo, hi, rows) & ~self.bits[rows, lo:hi]
+
+        # run starts and ends of all nodes at once (padded so every run is closed within its row)
+        edges = np.diff(np.pad(missing.astype(np.int8), ((0, 0), (1, 1))), axis = 1)
+        r, first = np.nonzero(edges == 1)
+        _, last = np.nonzero(edges == -1)
+        gdf = pd.DataFrame({'Node': self.nodes[rows[r]], 'Start': self.time_of(lo + first),
+                            'End': self.time_of(lo + last), 'Slots': last - first})
+
+        return gdf[gdf.Slots >= min_slots].reset_index(drop = True)
+
+    # nodes expected in the last hours before now (default: end of the index) without any data in them
+    def missing(self, hours, now = None):
+        if now is None:
+            now = self.time_of(self.n_slots)
+        lo, hi = self.window(pd.Timestamp(now) - pd.Timedelta(hours = hours), now)
+        expected = self.expected(lo, hi)
+        reported = (self.bits[:, lo:hi] & expected).any(axis = 1)
+
+        return list(self.nodes[expected.any(axis = 1) & ~reported])
+
+    # time of the latest received slot of each node
+    def last_seen(self):
+        bits = self.bits[:, :self.n_slots]
+        last = self.n_slots - 1 - np.argmax(bits[:, ::-1], axis = 1)
+
+        return pd.Series(np.where(bits.any(axis = 1), self.time_of(last), pd.NaT), index = self.nodes,
+                         dtype = 'datetime64[ns]', name = 'LastSeen')
+
+    # save index to a compressed NumPy file (bitmaps packed 8 slots per byte)
+    def save(self, path):
+        np.savez_compressed(path, freq = self.freq, exclude_flags = np.array(self.exclude_flags, dtype = str),
+                            origin = -1 if self.origin is None else self.origin.value,
+                            nodes = self.nodes.to_numpy(dtype = str), n_slots = self.n_slots,
+                            bits = np.packbits(self.bits[:, :self.n_slots], axis = 1),
+                            span = np.packbits(self.span[:, :self.n_slots], axis = 1))
+
+    # load index saved with save
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle = False)
+        index = cls(str(data['freq']), list(data['exclude_flags']))
+        index.origin = None if int(data['origin']) < 0 else pd.Timestamp(int(data['origin']))
+        index.nodes = pd.Index(data['nodes'], dtype = object)
+        index.n_slots = int(data['n_slots'])
+        index.bits = np.unpackbits(data['bits'], axis = 1, count = index.n_slots).astype(bool)
+        index.span = np.unpackbits(data['span'], axis = 1, count = index.n_slots).astype(bool)
+
+        return index
+
+    # load index if the file exists, otherwise start an empty one
+    @classmethod
+    def load_or_create(cls, path, freq = 'h', exclude_flags = []):
+        return cls.load(path) if os.path.exists(path) else cls(freq, exclude_flags)
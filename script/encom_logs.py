@@ -0,0 +1,62 @@
+import os
+import glob
+import pandas as pd
+
+# =============================================================================
+# streaming reader for Encom "Wireless Link Log" CSVs
+# =============================================================================
+
+# metrics in the link logs
+link_metrics = ['Tx Rate (Mbps)', 'Rx Rate (Mbps)', 'Tx CCQ (%)', 'Rx CCQ (%)']
+
+# function to list link log files in a folder (in time order of their names)
+def list_link_logs(folder):
+    return sorted(glob.glob(os.path.join(folder, '*Wireless Link Log.csv')))
+
+# function to aggregate one chunk to per node, per minute sums and counts
+def aggregate_chunk(chunk, nodes, metrics, freq):
+    # filter relevant nodes before any other work on the chunk
+    chunk = chunk[chunk['Source Name'].isin(nodes)]
+    if chunk.empty:
+        return None
+
+    # convert datetime and bin to the aggregation interval
+    dt = pd.to_datetime(chunk['Date'] + ' ' + chunk['Time'], format = '%m/%d/%Y %H:%M:%S')
+    keys = [chunk['Source Name'].rename('Node'), dt.dt.floor(freq).rename('DateTime')]
+
+    return chunk[metrics].groupby(keys).agg(['sum', 'count'])
+
+# function to stream link logs and return per node means at the given interval
+def read_link_logs(paths, nodes, metrics = link_metrics, name_map = None,
+                   freq = '1min', chunksize = 200_000):
+    usecols = ['Date', 'Time', 'Source Name'] + metrics
+
+    partials = []
+    for path in paths:
+        print(f"File: {path}")
+        # only selected columns are parsed, one chunk at a time
+        for chunk in pd.read_csv(path, usecols = usecols, chunksize = chunksize,
+                                 dtype = {'Date': str, 'Time': str, 'Source Name': str}):
+            agg = aggregate_chunk(chunk, nodes, metrics, freq)
+            if agg is not None:
+                partials.append(agg)
+
+            # fold partial aggregates so only one running total is kept per node and interval
+            if len(partials) > 8:
+                partials = [pd.concat(partials).groupby(level = [0, 1]).sum()]
+
+    if not partials:
+        return pd.DataFrame(columns = ['Node', 'DateTime'] + metrics)
+
+    totals = pd.concat(partials).groupby(level = [0, 1]).sum()
+
+    # means of each metric (intervals without values are NaN)
+    sums = totals.xs('sum', axis = 1, level = 1)
+    counts = totals.xs('count', axis = 1, level = 1)
+    adf = (sums / counts.where(counts > 0))[metrics].reset_index()
+
+    # rename nodes
+    if name_map is not None:
+        adf['Node'] = adf['Node'].map(name_map)
+
+    return adf
@@ -0,0 +1,114 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+# =============================================================================
+# cached Excel-to-Arrow conversion of vendor .xlsx exports
+# =============================================================================
+
+# default location of cached sheets
+cache_dir = "ignore/excel_cache"
+
+# function to compute content hash of a workbook
+def file_hash(file_path, block_size = 1 << 20):
+    h = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+
+    return h.hexdigest()
+
+# function to build cache file path of a sheet
+# (the key covers workbook content, sheet name and read options)
+def cache_path(content_hash, sheet_name, read_kwargs, cache_dir):
+    options = json.dumps([sheet_name, read_kwargs], sort_keys = True, default = str)
+    key = hashlib.sha256((content_hash + options).encode()).hexdigest()[:32]
+
+    return os.path.join(cache_dir, f"{key}.feather")
+
+# function to convert a column label to JSON (tuples of MultiIndex headers become lists)
+def encode_label(label):
+    if isinstance(label, tuple):
+        return [encode_label(x) for x in label]
+    if isinstance(label, float) and np.isnan(label):
+        return None
+    if isinstance(label, (np.integer, np.floating)):
+        return label.item()
+
+    return label
+
+# function to convert a JSON column label back to its original form
+def decode_label(label):
+    if isinstance(label, list):
+        return tuple(np.nan if x is None else x for x in label)
+
+    return label
+
+# function to write a sheet to the cache as Feather
+def write_cached(df, path):
+    labels = [encode_label(col) for col in df.columns]
+
+    # store columns by position, original labels are kept in schema metadata
+    xdf = df.copy()
+    xdf.columns = [str(i) for i in range(len(labels))]
+
+    # columns mixing numbers and text (e.g. 'No Data') are stored as text
+    for col in xdf.columns:
+        if pd.api.types.infer_dtype(xdf[col], skipna = True) in ('mixed', 'mixed-integer'):
+            xdf[col] = xdf[col].astype(str).where(xdf[col].notna())
+
+    table = pa.Table.from_pandas(xdf, preserve_index = False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[b'excel_columns'] = json.dumps(labels).encode()
+    table = table.replace_schema_metadata(metadata)
+
+    # write to a temporary file first so interrupted runs leave no partial cache
+    tmp_path = path + '.tmp'
+    feather.write_feather(table, tmp_path)
+    os.replace(tmp_path, path)
+
+# function to read a sheet from the cache
+def read_cached(path):
+    table = feather.read_table(path)
+    labels = [decode_label(x) for x in json.loads(table.schema.metadata[b'excel_columns'])]
+
+    df = table.to_pandas()
+    if labels and all(isinstance(x, tuple) for x in labels):
+        df.columns = pd.MultiIndex.from_tuples(labels)
+    else:
+        df.columns = labels
+
+    return df
+
+# function to make sure sheets of a workbook are cached, returns cache file paths by sheet name
+# (the workbook is hashed once and all missing sheets are parsed with a single open of it)
+def cache_sheets(file_path, sheet_names, cache_dir = cache_dir, **read_kwargs):
+    content_hash = file_hash(file_path)
+    paths = {sheet: cache_path(content_hash, sheet, read_kwargs, cache_dir) for sheet in sheet_names}
+
+    missing = [sheet for sheet, path in paths.items() if not os.path.exists(path)]
+    if missing:
+        os.makedirs(cache_dir, exist_ok = True)
+        with pd.ExcelFile(file_path) as xls:
+            for sheet in missing:
+                write_cached(xls.parse(sheet, **read_kwargs), paths[sheet])
+
+    return paths
+
+# function to read sheets of a workbook through the cache
+# returns a dict of dataframes by sheet name (a single dataframe if sheet_name is a string)
+def read_excel_cached(file_path, sheet_name = 0, cache_dir = cache_dir, **read_kwargs):
+    sheet_names = [sheet_name] if not isinstance(sheet_name, list) else sheet_name
+    paths = cache_sheets(file_path, sheet_names, cache_dir, **read_kwargs)
+
+    # load sheets from the cache (so first and later reads return the same types)
+    sheets = {sheet: read_cached(paths[sheet]) for sheet in sheet_names}
+
+    if not isinstance(sheet_name, list):
+        return sheets[sheet_name]
+
+    return {sheet: sheets[sheet] for sheet in sheet_names}
@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import pickle
+import hashlib
+import tempfile
+import subprocess
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+# =============================================================================
+# batch export of static figures in parallel worker processes
+# =============================================================================
+
+# default resolution of exported figures (lower resolutions, e.g. for drafts, are set per job)
+default_dpi = 1200
+
+# default file with input hashes of exported figures
+manifest_path = "output/figure_hashes.json"
+
+# function to compute hash of figure inputs (arrays, labels and render options)
+def figure_hash(kind, data, options):
+    h = hashlib.sha256(kind.encode())
+    for key in sorted(data):
+        value = data[key]
+        h.update(key.encode())
+        if isinstance(value, np.ndarray):
+            h.update(str(value.dtype).encode() + str(value.shape).encode())
+            h.update(np.ascontiguousarray(value).tobytes())
+        else:
+            h.update(json.dumps(value, default = str).encode())
+    h.update(json.dumps(options, sort_keys = True).encode())
+
+    return h.hexdigest()
+
+# function to build export job of a correlation heatmap
+def correlation_job(corr, title, output_path, dpi = default_dpi):
+    data = {'values': corr.to_numpy(dtype = float), 'labels': list(corr.columns), 'title': title}
+
+    return {'kind': 'correlation', 'data': data, 'options': {'dpi': dpi}, 'output_path': output_path}
+
+# function to build export job of an anomaly scatter plot
+def anomaly_job(x, y, is_anomaly, title, xlabel, ylabel, output_path, dpi = default_dpi):
+    data = {'x': np.asarray(x, dtype = float), 'y': np.asarray(y, dtype = float),
+            'is_anomaly': np.asarray(is_anomaly, dtype = bool),
+            'title': title, 'xlabel': xlabel, 'ylabel': ylabel}
+
+    return {'kind': 'anomaly', 'data': data, 'options': {'dpi': dpi}, 'output_path': output_path}
+
+# function to draw correlation heatmap with cell labels
+def render_correlation(ax, fig, data):
+    from matplotlib.collections import PathCollection
+    from matplotlib.textpath import TextPath
+    from matplotlib.transforms import Affine2D
+
+    values = data['values']
+    labels = data['labels']
+    cax = ax.matshow(values, cmap = 'coolwarm', vmin = -1, vmax = 1)
+    fig.colorbar(cax)
+    ticks = np.arange(0, len(labels), 1)
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(labels, rotation = 90)
+    ax.set_yticks(ticks)
+    ax.set_yticklabels(labels)
+
+    # cell labels are drawn in one pass as a single collection of glyph paths (not one text artist per cell):
+    # a centred path is built once per distinct label, sized in points and placed at the cell centres
+    texts = np.char.mod('%.2f', values)
+    glyphs = {}
+    for text in np.unique(texts):
+        path = TextPath((0, 0), text, size = 6)
+        box = path.get_extents()
+        glyphs[text] = path.transformed(Affine2D().translate(-(box.x0 + box.x1) / 2, -(box.y0 + box.y1) / 2))
+    rows, cols = np.indices(values.shape)
+    cell_labels = PathCollection([glyphs[text] for text in texts.ravel()],
+                                 offsets = np.column_stack([cols.ravel(), rows.ravel()]), offset_transform = ax.transData,
+                                 transform = Affine2D().scale(1 / 72) + fig.dpi_scale_trans,
+                                 facecolors = 'black', edgecolors = 'none')
+    ax.add_collection(cell_labels, autolim = False)
+
+    ax.set_title(data['title'], fontweight = 'bold')
+
+# function to draw scatter of normal points and anomalies
+def render_anomaly(ax, fig, data):
+    x, y, is_anomaly = data['x'], data['y'], data['is_anomaly']
+    ax.scatter(x[~is_anomaly], y[~is_anomaly], c = 'green', label = 'Normal',
+               alpha = 0.7, edgecolors = 'w', s = 30)
+    ax.scatter(x[is_anomaly], y[is_anomaly], c = 'red', label = 'Anomaly',
+               alpha = 0.7, edgecolors = 'w', s = 30)
+
+    # titles and labels
+    ax.set_title(data['title'], fontweight = 'bold')
+    ax.set_xlabel(data['xlabel'])
+    ax.set_ylabel(data['ylabel'])
+    ax.legend()
+
+renderers = {'correlation': render_correlation, 'anomaly': render_anomaly}
+
+# function to render and save one figure (runs in worker processes)
+def render_job(job):
+    # non-interactive backend, selected before pyplot is imported in the worker
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure()
+    ax = fig.add_subplot(111)
+    renderers[job['kind']](ax, fig, job['data'])
+    fig.savefig(job['output_path'], dpi = job['options']['dpi'], bbox_inches = 'tight')
+    plt.close(fig)
+
+    return job['output_path']
+
+# function to draw jobs in this process and show them in interactive windows (opt-in, exports do not show figures)
+def show_figures(jobs):
+    import matplotlib.pyplot as plt
+
+    for job in jobs:
+        fig = plt.figure()
+        ax = fig.add_subplot(111)
+        renderers[job['kind']](ax, fig, job['data'])
+        plt.show()
+
+# function to render jobs in a process pool
+def render_jobs(jobs, max_workers = None):
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        for output_path in executor.map(render_job, jobs):
+            print(f"Saved: {output_path}")
+
+# function to export figures in parallel, skipping figures whose inputs are unchanged
+# the process pool is started from a separate Python process running this module, so that
+# workers never re-import the calling analysis script (spawn start method on Windows/macOS)
+def export_figures(jobs, manifest_path = manifest_path, max_workers = None):
+    hashes = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            hashes = json.load(f)
+
+    # figures are rendered only if the file is missing or its inputs changed
+    todo = []
+    for job in jobs:
+        key = figure_hash(job['kind'], job['data'], job['options'])
+        if hashes.get(job['output_path']) == key and os.path.exists(job['output_path']):
+            print(f"Unchanged: {job['output_path']}")
+            continue
+        todo.append((job, key))
+
+    if todo:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jobs_path = os.path.join(tmp_dir, 'jobs.pkl')
+            with open(jobs_path, 'wb') as f:
+                pickle.dump([job for job, key in todo], f)
+            subprocess.run([sys.executable, os.path.abspath(__file__), jobs_path, str(max_workers or 0)],
+                           check = True)
+
+        for job, key in todo:
+            hashes[job['output_path']] = key
+        os.makedirs(os.path.dirname(manifest_path) or '.', exist_ok = True)
+        with open(manifest_path, 'w') as f:
+            json.dump(hashes, f, indent = 1)
+
+    return [job['output_path'] for job, key in todo]
+
+# =============================================================================
+# render pickled jobs (started by export_figures)
+# =============================================================================
+
+if __name__ == '__main__':
+    with open(sys.argv[1], 'rb') as f:
+        jobs = pickle.load(f)
+    render_jobs(jobs, int(sys.argv[2]) or None)
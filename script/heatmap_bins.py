@@ -0,0 +1,90 @@
+import os
+import json
+import pandas as pd
+
+# =============================================================================
+# resolution-aware binning of Node x DateTime heatmaps
+# =============================================================================
+
+# default target width of heatmaps in pixels (one bin per pixel at most)
+default_width = 1200
+
+# bin sizes to choose from, finest first
+bin_freqs = ['1min', '5min', '15min', '30min', '1h', '3h', '6h', '12h', '1D', '7D']
+
+# default location of cached multi-resolution tiles
+tile_dir = "ignore/heatmap_tiles"
+
+# function to choose the finest bin size that fits the time span into the width
+def choose_freq(start, end, width = default_width, freqs = bin_freqs):
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for freq in freqs:
+        if span / pd.Timedelta(freq) <= width:
+            return freq
+
+    return freqs[-1]
+
+# function to aggregate values of each node to time bins
+# returns long-form rows of Node, DateTime (bin start), min, mean, max and count
+def bin_values(xdf, value, freq, index = 'Node', time = 'DateTime'):
+    xdf = xdf[[index, time, value]].dropna(subset = [value])
+    bins = pd.to_datetime(xdf[time]).dt.floor(freq)
+
+    bdf = xdf[value].groupby([xdf[index], bins], observed = True).agg(['min', 'mean', 'max', 'count'])
+    bdf.index.names = [index, time]
+
+    return bdf.reset_index()
+
+# function to build a Node x DateTime matrix binned to fit the target width
+# drop-in replacement for pivot_table(index = 'Node', columns = 'DateTime', values = value, aggfunc = 'mean')
+def binned_pivot(xdf, value, width = default_width, stat = 'mean', index = 'Node', time = 'DateTime'):
+    times = pd.to_datetime(xdf[time])
+    freq = choose_freq(times.min(), times.max(), width)
+    bdf = bin_values(xdf, value, freq, index, time)
+
+    return bdf.pivot(index = index, columns = time, values = stat)
+
+# =============================================================================
+# multi-resolution tiles for zooming
+# =============================================================================
+
+# function to build path of a tile
+def tile_path(name, value, freq, tile_dir = tile_dir):
+    return os.path.join(tile_dir, name, f"{value}_{freq}.parquet".replace(' ', '_').replace('/', '_'))
+
+# function to pre-aggregate values at every bin size and cache them as Parquet tiles
+# tiles are rebuilt only when the input data changed
+def build_tiles(xdf, value, name, freqs = bin_freqs, tile_dir = tile_dir, index = 'Node', time = 'DateTime'):
+    data_hash = str(pd.util.hash_pandas_object(xdf[[index, time, value]], index = False).sum())
+    hash_path = os.path.join(tile_dir, name, f"{value}.hash".replace(' ', '_').replace('/', '_'))
+    if os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if json.load(f) == {'hash': data_hash, 'freqs': list(freqs)}:
+                return
+
+    os.makedirs(os.path.join(tile_dir, name), exist_ok = True)
+
+    # each level is aggregated from the next finer level (counts weight the means)
+    bdf = bin_values(xdf, value, freqs[0], index, time)
+    for i, freq in enumerate(freqs):
+        if i > 0:
+            bdf = bdf.assign(total = bdf['mean'] * bdf['count'])
+            bdf[time] = bdf[time].dt.floor(freq)
+            bdf = bdf.groupby([index, time], observed = True).agg(
+                min = ('min', 'min'), total = ('total', 'sum'), max = ('max', 'max'), count = ('count', 'sum')
+            ).reset_index()
+            bdf['mean'] = bdf['total'] / bdf['count']
+            bdf = bdf[[index, time, 'min', 'mean', 'max', 'count']]
+        bdf.to_parquet(tile_path(name, value, freq, tile_dir), index = False)
+
+    with open(hash_path, 'w') as f:
+        json.dump({'hash': data_hash, 'freqs': list(freqs)}, f)
+
+# function to read the tile level that fits a time window into the width
+def read_tile(name, value, start, end, width = default_width, stat = 'mean', freqs = bin_freqs,
+              tile_dir = tile_dir, index = 'Node', time = 'DateTime'):
+    freq = choose_freq(start, end, width, freqs)
+    bdf = pd.read_parquet(tile_path(name, value, freq, tile_dir), columns = [index, time, stat],
+                          filters = [(time, '>=', pd.Timestamp(start)), (time, '<=', pd.Timestamp(end))])
+
+    return bdf.pivot(index = index, columns = time, values = stat)
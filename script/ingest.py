@@ -0,0 +1,244 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+from excel_cache import read_excel_cached, write_cached, read_cached
+from time_parse import export_date_range, split_vendor_time, infer_year, vendor_timestamps
+from calendar_index import CalendarIndex
+from coverage import CoverageIndex, received
+from instrument import stage, measure, add_records
+
+# =============================================================================
+# parallel, incremental ingestion of radio export folders
+# =============================================================================
+
+# list of column names in the radio exports
+cols = ['Time', 'Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)',
+       'Packet Loss', '2.4 GHz Noise', '5.8 GHz Noise', '2.4 GHz Airtime TX',
+       '2.4 GHz Airtime RX', '2.4 GHz Airtime Total',
+       '5.8 GHz Airtime TX', '5.8 GHz Airtime RX',
+       '5.8 GHz Airtime Total', 'PSP', 'RPSP', 'Tx Rate (Kbps)',
+       'Rx Rate (Kbps)', '5.8 GHz Tx Rate (Kbps)', '5.8 GHz Rx Rate (Kbps)',
+       '2.4 GHz Routed Clients', '5.8 GHz Routed Clients', 'Neighbors',
+       'Hop Count', '2.4 GHz Channel', '5.8 GHz Channel',
+       'Next Hop Upstream Router']
+
+# file extensions with radio data
+extensions = ('.csv', '.xlsx')
+
+# calendar flags of hours excluded from analysis (December due to holidays, see calendar_index.py)
+exclude_flags = ['IsHolidayMonth']
+
+# function to read raw data of a single node file
+def read_node_file(file_path):
+    file = os.path.basename(file_path)
+
+    # check whether the file ends in .csv or .xlsx
+    # these extensions have different formatting styles for the header
+    if file.endswith('.csv'):
+        data = pd.read_csv(file_path, header = None, names = cols, skiprows = 1)
+        node = file[:-4]
+    elif file.endswith('.xlsx'):
+        data = read_excel_cached(file_path, sheet_name = 'Sheet1', header = None, names = cols, skiprows = 2)
+        node = file[:-5]
+
+    # add node/intersection name as variable
+    data['Node'] = node
+
+    return data
+
+# function to get the study area of node names (from the street names in them)
+def area_of(nodes):
+    nodes = pd.Series(nodes, dtype = str)
+
+    return np.select([nodes.str.contains('Greenway|Thunderbird'),
+                      nodes.str.contains('Indian School|Osborn|Thomas'),
+                      nodes.str.contains('Van Buren|Buckeye')],
+                     ['Kierland', 'Thomas', 'Southwest'])
+
+# function to process raw data of a single node file
+# start is the first date of the export folder, used to infer the year
+def process_node_data(data, start):
+    # parse "Mon DD HH" times into integer components and convert to datetime
+    month, day, hour = split_vendor_time(data.Time)
+    times = vendor_timestamps(infer_year(month, start), month, day, hour)
+
+    # filter out rows with malformed times and data of hours flagged in the calendar (due to holidays)
+    invalid = np.isnat(times)
+    if invalid.any():
+        print(f"Dropped {invalid.sum()} rows with malformed times, e.g. {data.Time[invalid].iloc[0]!r}")
+    keep = ~invalid & ~CalendarIndex.covering(times).flagged(times, exclude_flags)
+    data = data[keep].copy()
+    data.Time = times[keep]
+
+    # add study area
+    data['Area'] = area_of(data.Node)
+
+    return data
+
+# function to read and process a single node file (runs in worker processes)
+def ingest_file(file_path):
+    start, end = export_date_range(file_path)
+    with stage('read_node_file', file = file_path) as rec:
+        data = read_node_file(file_path)
+        rec['rows'] = len(data)
+    with stage('process_node_data', rows = len(data), file = file_path):
+        return process_node_data(data, start)
+
+# function to ingest a file and return it with the stage records of the worker (see instrument.py)
+def measure_ingest_file(file_path):
+    return measure('ingest_file', ingest_file, file_path, file = file_path)
+
+# function to list size and modification time of every node file in folders
+def scan_folders(folders):
+    files = {}
+    for folder in folders:
+        for file in sorted(os.listdir(folder)):
+            if not file.endswith(extensions):
+                continue
+            file_path = os.path.join(folder, file)
+            stat = os.stat(file_path)
+            files[file_path] = {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    return files
+
+# function to load manifest of previously ingested files
+def load_manifest(manifest_path):
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+# function to save manifest of ingested files
+def save_manifest(manifest, manifest_path):
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent = 1)
+    os.replace(tmp_path, manifest_path)
+
+# function to build path of the processed rows of a node file (one Feather file per export file)
+def output_file(output_dir, file_path):
+    key = hashlib.sha256(file_path.encode()).hexdigest()[:32]
+
+    return os.path.join(output_dir, f"{key}.feather")
+
+# function to concatenate processed rows (an empty frame with the processed columns if there are none)
+def concat_rows(list_df):
+    if not list_df:
+        return pd.DataFrame(columns = cols + ['Node', 'Area'])
+
+    return pd.concat(list_df, ignore_index = True)
+
+# function to list node months (Node, YearMonth) of time windows (Node, Start, End)
+def window_months(windows):
+    return {(node, str(month)) for node, start, end in windows
+            for month in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq = 'M')}
+
+# function to read the processed rows of all ingested files (listed in the manifest of output_dir)
+def read_outputs(output_dir, manifest_path = None):
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir, 'manifest.json')
+
+    return concat_rows([read_cached(output_file(output_dir, path)) for path in load_manifest(manifest_path)])
+
+# function to ingest new or changed node files, processed rows of each file are kept in output_dir
+# returns the rows of node months touched in this run (rows of changed files and of unchanged files
+# in the same months, see radio_store.replace_partitions) and the windows (Node, Start, End) of rows
+# added or dropped in this run
+def update_processed(folders, output_dir, manifest_path = None, coverage_path = None, max_workers = None):
+    if manifest_path is None:
+        manifest_path = os.path.join(output_dir, 'manifest.json')
+    if coverage_path is None:
+        coverage_path = os.path.join(output_dir, 'coverage.npz')
+    os.makedirs(output_dir, exist_ok = True)
+
+    files = scan_folders(folders)
+    manifest = load_manifest(manifest_path)
+
+    # files that are new, whose size/mtime changed since the last run or whose processed rows are missing
+    changed = [path for path, stat in files.items()
+               if path not in manifest
+               or manifest[path]['size'] != stat['size']
+               or manifest[path]['mtime'] != stat['mtime']
+               or not os.path.exists(output_file(output_dir, path))]
+    removed = [path for path in manifest if path not in files]
+
+    if not changed and not removed and os.path.exists(coverage_path):
+        print("No new or changed files")
+        return concat_rows([]), pd.DataFrame(columns = ['Node', 'Start', 'End'])
+
+    # windows of rows contributed earlier by changed or removed files
+    stale_windows = [(entry['node'], entry['start'], entry['end'])
+                     for entry in (manifest.get(path) for path in changed + removed)
+                     if entry is not None and entry['start'] is not None]
+
+    # coverage index is updated in place unless this is the first run or the index is missing
+    rebuild = not manifest or not os.path.exists(coverage_path)
+
+    # read changed files in a process pool, processed rows of each file are written to its own output
+    new_data = {}
+    if changed:
+        with stage('ingest_files', files = len(changed)) as rec, ProcessPoolExecutor(max_workers = max_workers) as executor:
+            for file_path, (data, file_recs) in zip(changed, executor.map(measure_ingest_file, changed)):
+                print(f"File: {file_path}")
+                write_cached(data, output_file(output_dir, file_path))
+                new_data[file_path] = data
+                add_records(file_recs)
+            rec['rows'] = sum(len(data) for data in new_data.values())
+
+    # drop processed rows of removed files
+    for path in removed:
+        if os.path.exists(output_file(output_dir, path)):
+            os.remove(output_file(output_dir, path))
+
+    # record file stats along with the node and time range each file contributed
+    for path in removed:
+        del manifest[path]
+    for path, data in new_data.items():
+        node = os.path.splitext(os.path.basename(path))[0]
+        start = data.Time.min() if len(data) else None
+        end = data.Time.max() if len(data) else None
+        manifest[path] = dict(files[path], node = node,
+                              start = None if start is None else str(start),
+                              end = None if end is None else str(end))
+    save_manifest(manifest, manifest_path)
+
+    # windows of rows contributed now by changed files
+    new_windows = [(manifest[path]['node'], manifest[path]['start'], manifest[path]['end'])
+                   for path in changed if manifest[path]['start'] is not None]
+
+    # rows of unchanged files in the node months touched by this run are read back from their outputs
+    months = window_months(stale_windows + new_windows)
+    kept = [path for path, entry in manifest.items()
+            if path not in new_data and entry['start'] is not None
+            and window_months([(entry['node'], entry['start'], entry['end'])]) & months]
+    with stage('read_outputs', files = len(kept)) as rec:
+        df = concat_rows(list(new_data.values()) + [read_cached(output_file(output_dir, path)) for path in kept])
+        rec['rows'] = len(df)
+
+    # hourly coverage of each node, expected within the windows of ingested files (from the manifest):
+    # windows of changed or removed files are replaced by those of the new rows
+    # (rebuilt from the rows of all files on the first run or when the index is missing)
+    with stage('update_coverage'):
+        if rebuild:
+            coverage = CoverageIndex('h', exclude_flags)
+            for path in manifest:
+                data = new_data[path] if path in new_data else read_cached(output_file(output_dir, path))
+                coverage.update(data.Node, data.Time, received(data))
+            expect = [(entry['node'], entry['start'], entry['end'])
+                      for entry in manifest.values() if entry['start'] is not None]
+        else:
+            coverage = CoverageIndex.load(coverage_path)
+            for node, start, end in stale_windows:
+                coverage.clear(node, start, end)
+            for data in new_data.values():
+                coverage.update(data.Node, data.Time, received(data))
+            expect = new_windows
+        if expect:
+            coverage.expect(*zip(*expect))
+        coverage.save(coverage_path)
+
+    return df, pd.DataFrame(stale_windows + new_windows, columns = ['Node', 'Start', 'End'])
@@ -0,0 +1,183 @@
+import os
+import sys
+import json
+import time
+import cProfile
+import threading
+import contextlib
+import pandas as pd
+
+# resource is only available on Unix, psutil is optional (e.g. on Windows)
+try:
+    import resource
+except ImportError:
+    resource = None
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# =============================================================================
+# stage-level timing, CPU, memory and row counts of pipeline runs
+# =============================================================================
+
+# default location of run logs (one JSON file per run and a CSV of all stages of all runs)
+log_dir = "ignore/run_logs"
+
+# stages profiled with cProfile, e.g. PROFILE_STAGES=summarize,anomaly_fit (or 'all')
+# profiles are written to <log_dir>/profiles/<stage>_<pid>.prof (readable with pstats or snakeviz)
+profile_stages = [s for s in os.environ.get('PROFILE_STAGES', '').split(',') if s]
+
+# seconds between resident memory samples taken during a stage
+rss_interval = 0.01
+
+# records of stages measured in this process
+records = []
+
+# profilers of enclosing stages (nested stages are covered by the outer profile)
+profilers = []
+
+# columns of the CSV log (other fields of a record are kept as JSON in 'detail')
+log_cols = ['stage', 'rows', 'wall_s', 'cpu_s', 'peak_rss_mb', 'pid', 'start']
+
+# function to get CPU time of this process and its finished child processes (seconds)
+def cpu_seconds():
+    seconds = time.process_time()
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        seconds += children.ru_utime + children.ru_stime
+
+    return seconds
+
+# function to get current resident memory of this process (MB)
+def rss_mb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1e6
+    except (OSError, ValueError, AttributeError):
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1e6
+
+    return None
+
+# function to get peak resident memory of this process so far (MB, high-water mark of the whole process)
+def process_peak_rss_mb():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kibibytes on Linux, bytes on macOS
+        return peak / 1e6 if sys.platform == 'darwin' else peak * 1024 / 1e6
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, 'peak_wset', info.rss) / 1e6
+
+    return None
+
+class RssSampler:
+    # samples resident memory in a background thread while a stage runs, peak is the largest sample (MB)
+    # (allocations freed between two samples are missed, so the peak is a lower bound)
+    def __init__(self, interval = rss_interval):
+        self.interval = interval
+        self.peak = rss_mb()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+    def sample(self):
+        rss = rss_mb()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def run(self):
+        while not self.done.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        if self.peak is not None:
+            self.thread.start()
+
+        return self
+
+    # stop sampling and return the peak
+    def stop(self):
+        self.done.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.sample()
+
+        return self.peak
+
+# context manager to measure a named stage, e.g.
+#   with stage('summarize', rows = len(df)) as rec:
+#       ...
+# rec['rows'] (and any other field) can also be set inside the block
+@contextlib.contextmanager
+def stage(name, rows = None, **fields):
+    rec = {'stage': name, 'rows': rows, **fields}
+    profiler = None
+    if (name in profile_stages or 'all' in profile_stages) and not profilers:
+        profiler = cProfile.Profile()
+        profilers.append(profiler)
+
+    # pid and wall-clock start align records with external samplers such as py-spy record --pid
+    rec['start'] = str(pd.Timestamp.now())
+    wall, cpu = time.perf_counter(), cpu_seconds()
+    sampler = RssSampler().start()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield rec
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profilers.remove(profiler)
+            os.makedirs(os.path.join(log_dir, 'profiles'), exist_ok = True)
+            profiler.dump_stats(os.path.join(log_dir, 'profiles', f"{name}_{os.getpid()}.prof".replace(' ', '_')))
+        rec['wall_s'] = round(time.perf_counter() - wall, 4)
+        rec['cpu_s'] = round(cpu_seconds() - cpu, 4)
+        # peak of this stage, and of the whole process so far (kept in the detail of the CSV log)
+        rec['peak_rss_mb'] = sampler.stop()
+        rec['process_peak_rss_mb'] = process_peak_rss_mb()
+        rec['pid'] = os.getpid()
+        records.append(rec)
+
+# function to call func inside a measured stage and return its result with the records of the call
+# (used in worker processes, whose records are sent back and added with add_records)
+def measure(name, func, *args, **fields):
+    first = len(records)
+    with stage(name, **fields) as rec:
+        result = func(*args)
+        if rec['rows'] is None and hasattr(result, '__len__'):
+            rec['rows'] = len(result)
+    recs = records[first:]
+    del records[first:]
+
+    return result, recs
+
+# function to add records measured in other processes
+def add_records(recs):
+    records.extend(recs)
+
+# function to write the records of this run as JSON and append them to the CSV log of all runs
+# records are cleared after saving (long-running processes save one log per period of work)
+def save_run_log(run_name, log_dir = log_dir):
+    if not records:
+        return None
+
+    os.makedirs(log_dir, exist_ok = True)
+    started = pd.Timestamp.now().floor('s')
+    run = {'run': run_name, 'time': str(started), 'python': sys.version.split()[0],
+           'argv': sys.argv, 'stages': records}
+
+    json_path = os.path.join(log_dir, f"{run_name}_{started:%Y%m%d_%H%M%S}.json")
+    with open(json_path, 'w') as f:
+        json.dump(run, f, indent = 1, default = str)
+
+    csv_path = os.path.join(log_dir, 'run_log.csv')
+    rdf = pd.DataFrame([{'run': run_name, 'time': started, **{col: rec.get(col) for col in log_cols},
+                         'detail': json.dumps({k: v for k, v in rec.items() if k not in log_cols}, default = str)}
+                        for rec in records])
+    rdf['rows'] = rdf['rows'].astype('Int64')
+    rdf.to_csv(csv_path, mode = 'a', header = not os.path.exists(csv_path), index = False)
+    records.clear()
+
+    return json_path
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# co-channel interference of nodes in the same area and hour
+# =============================================================================
+
+# columns of each band and the channel number distance below which two channels overlap
+# (2.4 GHz: 20 MHz channels on a 5 MHz grid overlap within 4 channel numbers,
+#  5.8 GHz: 20 MHz channels on a 5 MHz grid overlap within 3 channel numbers)
+bands = {'2.4 GHz': {'channel': '2.4 GHz Channel', 'noise': '2.4 GHz Noise',
+                     'airtime': '2.4 GHz Airtime Total', 'spacing': 5},
+         '5.8 GHz': {'channel': '5.8 GHz Channel', 'noise': '5.8 GHz Noise',
+                     'airtime': '5.8 GHz Airtime Total', 'spacing': 4}}
+
+# throughput and neighbor columns related to the overlaps
+related_cols = ['Upload (Mbps)', 'Download (Mbps)', 'Neighbors']
+
+# columns needed from the processed data (e.g. for read_store)
+input_cols = (['Area', 'Node', 'Time'] + related_cols +
+              [band[col] for band in bands.values() for col in ['channel', 'noise', 'airtime']])
+
+# function to count, for every row, the other rows of its group with a channel less than spacing apart
+# rows are sorted once by (group, channel) and both window ends are found with searchsorted
+def count_within(group, channel, spacing):
+    valid = ~np.isnan(channel)
+    counts = np.zeros(len(channel), dtype = np.int32)
+    if not valid.any():
+        return counts
+
+    # one sortable key per row, keys of different groups are always more than spacing apart
+    offset = channel[valid] - channel[valid].min()
+    key = group[valid] * (offset.max() + 2 * spacing) + offset
+    keys = np.sort(key)
+    counts[valid] = (np.searchsorted(keys, key + (spacing - 1), side = 'right') -
+                     np.searchsorted(keys, key - (spacing - 1), side = 'left') - 1)
+
+    return counts
+
+# function to find co-channel and overlapping-channel nodes of every node-hour and band
+# returns long-form rows of Area, Node, Time, Band, Channel, CoChannel and Overlapping counts
+# along with noise, airtime, throughput and neighbors of the node in that hour
+def channel_overlaps(df):
+    hours = pd.to_datetime(df.Time).dt.floor('h')
+    group = df.groupby([df.Area, hours], observed = True, sort = False).ngroup().to_numpy()
+
+    list_df = []
+    for band, c in bands.items():
+        channel = pd.to_numeric(df[c['channel']], errors = 'coerce').to_numpy(float) # unknown channels are nan
+        odf = pd.DataFrame({'Area': df.Area.to_numpy(), 'Node': df.Node.to_numpy(), 'Time': hours.to_numpy(),
+                            'Band': band, 'Channel': channel,
+                            'CoChannel': count_within(group, channel, 1),
+                            'Overlapping': count_within(group, channel, c['spacing']),
+                            'Noise': df[c['noise']].to_numpy(float), 'Airtime': df[c['airtime']].to_numpy(float)})
+        for col in related_cols:
+            odf[col] = df[col].to_numpy(float)
+        list_df.append(odf[~np.isnan(channel)])
+
+    odf = pd.concat(list_df, ignore_index = True)
+    odf['Band'] = odf['Band'].astype('category')
+
+    return odf
+
+# function to relate overlaps to noise, airtime and throughput
+# mean of each metric by band and number of overlapping nodes (0, 1, 2, 3+), per area
+def relate_overlaps(odf, metrics = ['Noise', 'Airtime'] + related_cols, by = ['Area', 'Band']):
+    level = np.minimum(odf.Overlapping.to_numpy(), 3)
+    labels = pd.Categorical.from_codes(level, ['0', '1', '2', '3+'])
+    rdf = odf.groupby(by + [labels], observed = True)[metrics].mean()
+    rdf.index = rdf.index.set_names(by + ['Overlapping'])
+    rdf['N'] = odf.groupby(by + [labels], observed = True).size()
+
+    return rdf.reset_index()
+
+# function to correlate the number of overlapping nodes with each metric, per area and band
+def overlap_correlation(odf, metrics = ['Noise', 'Airtime'] + related_cols, by = ['Area', 'Band']):
+    return (odf.groupby(by, observed = True)[metrics]
+               .corrwith(odf.Overlapping.astype(float))
+               .reset_index())
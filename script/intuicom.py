@@ -0,0 +1,56 @@
+import pandas as pd
+from openpyxl import load_workbook
+from concurrent.futures import ProcessPoolExecutor
+
+from excel_cache import cache_sheets, read_cached
+from vendor_schema import intuicom_counters, adapters, normalize
+
+# =============================================================================
+# Intuicom workbooks: discovery and parallel decoding of link sheets
+# =============================================================================
+
+# rows above the header of each link sheet (title rows)
+header_skiprows = 2
+
+# columns that identify a link sheet
+link_columns = [adapters['intuicom']['time']] + intuicom_counters
+
+# function to list link sheets of a workbook (sheets whose header has the time and epoch counter columns)
+# only the header rows are read, in read-only mode
+def list_link_sheets(path, skiprows = header_skiprows):
+    wb = load_workbook(path, read_only = True)
+    try:
+        sheets = []
+        for ws in wb.worksheets:
+            rows = list(ws.iter_rows(min_row = skiprows + 1, max_row = skiprows + 1, values_only = True))
+            header = set(rows[0]) if rows else set()
+            if all(col in header for col in link_columns):
+                sheets.append(ws.title)
+    finally:
+        wb.close()
+
+    return sheets
+
+# function to decode one cached link sheet to the canonical schema (runs in worker processes)
+def decode_sheet(cached_path, area, node, decimals = 2):
+    data = read_cached(cached_path)
+
+    return normalize(data, 'intuicom', area = area, node = node, decimals = decimals)
+
+# function to decode all link sheets of a workbook concurrently
+# node names are taken from sheet_nodes (sheet name -> node), unknown sheets keep the sheet name
+# must be called under if __name__ == '__main__' since it starts a process pool
+def process_workbook(path, area, sheet_nodes = {}, max_workers = None):
+    sheets = list_link_sheets(path)
+    nodes = [sheet_nodes.get(sheet, sheet) for sheet in sheets]
+    if not sheets:
+        return pd.DataFrame(columns = ['Area', 'Node', 'DateTime'])
+
+    # the workbook is hashed and parsed once for all sheets (see excel_cache.py), workers read the cached sheets
+    paths = cache_sheets(path, sheets, skiprows = header_skiprows)
+    with ProcessPoolExecutor(max_workers = max_workers) as executor:
+        list_df = list(executor.map(decode_sheet, [paths[sheet] for sheet in sheets], [area] * len(sheets), nodes))
+    for sheet, data in zip(sheets, list_df):
+        print(f"Sheet: {sheet} ({len(data)} rows)")
+
+    return pd.concat(list_df, ignore_index = True)
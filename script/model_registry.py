@@ -0,0 +1,206 @@
+import os
+import re
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+
+from radio_store import read_store
+from calendar_index import CalendarIndex
+
+# =============================================================================
+# persistent registry of XGBoost models for the performance metrics
+# =============================================================================
+
+# default location of the registry
+registry_dir = "ignore/model_registry"
+
+# performance metrics predicted by the models
+targets = ['Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)', 'Packet Loss']
+
+# relevant metrics
+metrics_all = ['Upload (Mbps)', 'Download (Mbps)',
+               'Latency (ms)', 'Packet Loss',
+               '2.4 GHz Noise', '5.8 GHz Noise',
+               'Tx Rate (Kbps)', 'Rx Rate (Kbps)',
+               '2.4 GHz Airtime Total', '5.8 GHz Airtime Total',
+               '2.4 GHz Routed Clients', 'Hop Count']
+
+# XGBoost hyperparameters
+xgb_params = dict(
+    n_estimators = 200,
+    learning_rate = 0.1,
+    max_depth = 5,
+    min_child_weight = 5,
+    gamma = 0.1,
+    reg_alpha = 0.5,
+    reg_lambda = 0.5
+)
+
+# function to read analysis dataset (Area, Node, Time, Peak and metrics) from Parquet store
+def read_model_data(months = None, areas = None):
+    df = read_store(columns = ['Area', 'Node', 'Time'] + metrics_all, areas = areas, months = months, compact = True)
+
+    # classify hours into 4 peaks (categorical codes gathered from the calendar)
+    df.insert(3, 'Peak', CalendarIndex.covering(df.Time).peak(df.Time))
+
+    return df
+
+# function to one-hot encode integer codes of a categorical
+# columns follow sorted category names and the first is dropped, as get_dummies(drop_first = True)
+def one_hot(codes, categories, prefix):
+    observed = np.bincount(codes[codes >= 0], minlength = len(categories)) > 0
+    order = [i for i in np.argsort(np.asarray(categories, dtype = str), kind = 'stable') if observed[i]]
+
+    return {f'{prefix}_{categories[i]}': (codes == i).astype(np.int8) for i in order[1:]}
+
+# function to one-hot encode Peak and Area of the analysis dataset
+def prepare_features(df):
+    # one-hot encoding: Peak and Area (compared with integer codes, no string work)
+    peak = df.Peak.astype('category')
+    area = df.Area.astype('category')
+    dummies = {**one_hot(peak.cat.codes.to_numpy(), peak.cat.categories, 'is_peak'),
+               **one_hot(area.cat.codes.to_numpy(), area.cat.categories, 'is_area')}
+
+    # dummies replace Peak and Area (the input frame is not copied or modified)
+    return df.drop(columns = ['Peak', 'Area']).assign(**dummies)
+
+# function to build file name stem of a target, e.g. 'Latency (ms)' -> 'Latency_ms'
+def target_stem(target):
+    return re.sub(r'[^\w]+', '_', target).strip('_')
+
+# function to compute fingerprint of training data, features and hyperparameters
+def data_fingerprint(X, y, params):
+    h = hashlib.sha256()
+    h.update(json.dumps([list(X.columns), y.name, params], sort_keys = True).encode())
+    h.update(pd.util.hash_pandas_object(X, index = False).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index = False).to_numpy().tobytes())
+
+    return h.hexdigest()
+
+# function to read registry entry (metadata) of a target
+def load_entry(target, registry_dir = registry_dir):
+    path = os.path.join(registry_dir, target_stem(target) + '.meta.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+# function to train one model, evaluate it on a held-out split and save it
+def train_model(df, target, predictors, params = xgb_params, registry_dir = registry_dir, force = False):
+    # create dataset
+    xdf = df[[target] + predictors].dropna(subset = target)
+    X = xdf[predictors]
+    y = xdf[target]
+
+    # skip retraining if data, features and hyperparameters are unchanged
+    fingerprint = data_fingerprint(X, y, params)
+    entry = load_entry(target, registry_dir)
+    if not force and entry is not None and entry['fingerprint'] == fingerprint:
+        print(f"{target}: unchanged, using registered model")
+        return entry
+
+    # training machinery is only imported when a model is trained
+    import xgboost as xgb
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
+    # split dataset into training and test sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size = 0.25, random_state = 42)
+
+    # fit regressor to training set
+    xgb_model = xgb.XGBRegressor(**params)
+    xgb_model.fit(X_train, y_train)
+
+    # compute RMSE and MAPE of predictions on the test set
+    y_pred = xgb_model.predict(X_test)
+    mape = mean_absolute_percentage_error(y_test, y_pred)
+    rmse = np.sqrt(mean_squared_error(y_test, y_pred))
+    print(f"{target}: MAPE, RMSE: {mape:.2f}, {rmse:.2f}")
+
+    # save model in XGBoost JSON format along with its metadata
+    os.makedirs(registry_dir, exist_ok = True)
+    stem = target_stem(target)
+    xgb_model.save_model(os.path.join(registry_dir, stem + '.json'))
+
+    entry = {'target': target, 'features': predictors, 'fingerprint': fingerprint,
+             'params': params, 'n_rows': len(xdf), 'mape': float(mape), 'rmse': float(rmse),
+             'model_file': stem + '.json'}
+    with open(os.path.join(registry_dir, stem + '.meta.json'), 'w') as f:
+        json.dump(entry, f, indent = 1)
+
+    return entry
+
+# function to train models of all targets
+# (each target's predictors are all columns except the targets)
+def train_models(df, targets = targets, params = xgb_params, registry_dir = registry_dir, force = False):
+    predictors = [col for col in df.columns if col not in targets]
+
+    return {target: train_model(df, target, predictors, params, registry_dir, force) for target in targets}
+
+# =============================================================================
+# fast batch prediction with NumPy (no xgboost or sklearn import)
+# =============================================================================
+
+# function to load the trees of a saved model as padded NumPy arrays
+def load_trees(target, registry_dir = registry_dir):
+    entry = load_entry(target, registry_dir)
+    if entry is None:
+        raise FileNotFoundError(f"No registered model for target: {target}")
+    with open(os.path.join(registry_dir, entry['model_file'])) as f:
+        model = json.load(f)
+
+    learner = model['learner']
+    trees = learner['gradient_booster']['model']['trees']
+    n_nodes = max(len(tree['left_children']) for tree in trees)
+
+    # arrays of shape (trees, nodes), padded nodes are leaves with value 0
+    def stack(key, fill, dtype):
+        arr = np.full((len(trees), n_nodes), fill, dtype = dtype)
+        for i, tree in enumerate(trees):
+            arr[i, :len(tree[key])] = tree[key]
+        return arr
+
+    base_score = learner['learner_model_param']['base_score'].strip('[]')
+
+    return {'features': entry['features'],
+            'left': stack('left_children', -1, np.int32),
+            'right': stack('right_children', -1, np.int32),
+            'feature': stack('split_indices', 0, np.int32),
+            'threshold': stack('split_conditions', 0, np.float32),
+            'default_left': stack('default_left', 0, bool),
+            'base_score': float(base_score)}
+
+# function to predict a target for new radio data (batches of rows through all trees at once)
+def predict_trees(trees, X, batch_size = 20_000):
+    X = X.reindex(columns = trees['features'], fill_value = 0).to_numpy(dtype = np.float32)
+    n_trees = trees['left'].shape[0]
+    tree_idx = np.arange(n_trees)
+
+    pred = np.empty(len(X), dtype = np.float32)
+    for start in range(0, len(X), batch_size):
+        xb = X[start:start + batch_size]
+        rows = np.arange(len(xb))[:, None]
+        node = np.zeros((len(xb), n_trees), dtype = np.int32)
+
+        # walk every tree one level per step until all rows reach a leaf
+        while True:
+            left = trees['left'][tree_idx, node]
+            is_leaf = left == -1
+            if is_leaf.all():
+                break
+            value = xb[rows, trees['feature'][tree_idx, node]]
+            go_left = np.where(np.isnan(value), trees['default_left'][tree_idx, node],
+                               value < trees['threshold'][tree_idx, node])
+            child = np.where(go_left, left, trees['right'][tree_idx, node])
+            node = np.where(is_leaf, node, child)
+
+        # leaf values are stored in split_conditions
+        pred[start:start + len(xb)] = trees['base_score'] + trees['threshold'][tree_idx, node].sum(axis = 1)
+
+    return pred
+
+# function to predict all registered targets for new radio data
+def predict(df, targets = targets, registry_dir = registry_dir):
+    return pd.DataFrame({target: predict_trees(load_trees(target, registry_dir), df) for target in targets},
+                        index = df.index)
@@ -1,51 +1,26 @@
 import os
-import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 
 from sklearn.ensemble import IsolationForest
 
-import plotly.express as px
+from radio_store import read_store
+from summary import summarize_metrics, select_metrics
+from correlation import CorrelationCube
+from figure_export import correlation_job, anomaly_job, export_figures
+from box_stats import box_plot
+from calendar_index import CalendarIndex, peak_names
+from instrument import stage, save_run_log
+from topology import TopologyIndex
+from coverage import CoverageIndex
+from interference import input_cols as interference_cols, channel_overlaps, relate_overlaps, overlap_correlation
+
 import plotly.io as pio
 pio.renderers.default = 'browser'
 
 os.chdir(r"D:\GitHub\wireless_communication")
 
-# read data
-file_input = "ignore/radio_data_processed.txt"
-df = pd.read_csv(file_input, sep = '\t')
-
 study_areas = ['Kierland', ]
 
-# =============================================================================
-# data preprocessing
-# =============================================================================
-
-# convert time to datetime
-df.Time = pd.to_datetime(df.Time) # convert to pandas datetime
-
-# # check next hop upstream router
-# hop_df = df.copy()[['Node', 'Next Hop Upstream Router']]
-# hop_df.drop_duplicates(inplace = True)
-
-# check data availability for each node
-# px.scatter(df, x = 'Time', y = 'Node').show()
-
-# add month, day, hour variables
-df['Month'] = df.Time.dt.month
-df['Day'] = df.Time.dt.day_name()
-df['Hour'] = df.Time.dt.hour
-
-# classify hours into 4 peaks
-df['Peak'] = np.select([(df.Hour >= 6) & (df.Hour < 10),
-                        (df.Hour >= 10) & (df.Hour < 15),
-                        (df.Hour >= 15) & (df.Hour < 19),
-                        (df.Hour >= 19) | (df.Hour < 6)],
-                       ['Morning', 'Mid-day', 'Evening', 'Night'])
-
-# filter data for January 2024
-df = df[df.Month == 1]
-
 # select relevant metrics
 metrics_all = ['Upload (Mbps)', 'Download (Mbps)',
                'Latency (ms)', 'Packet Loss',
@@ -54,92 +29,88 @@ metrics_all = ['Upload (Mbps)', 'Download (Mbps)',
                '2.4 GHz Airtime Total', '5.8 GHz Airtime Total',
                '2.4 GHz Routed Clients', 'Hop Count']
 perf_metrics = metrics_all[:4]
+env_metrics = ['2.4 GHz Noise', '5.8 GHz Noise', 'Hop Count']
+util_metrics = ['Tx Rate (Kbps)', 'Rx Rate (Kbps)', '2.4 GHz Airtime Total', '5.8 GHz Airtime Total']
 # Note: '5.8_GHz_Routed_Clients' is removed as it has 0 values.
 
-# select relevant columns for analysis
-df = df[['Area', 'Node', 'Time', 'Peak'] + metrics_all]
-
-# convert columns to float type
-cols_float = ['Packet Loss', '2.4 GHz Airtime Total', '5.8 GHz Airtime Total']
-df[cols_float] = df[cols_float].astype(float)
-
-# df.to_csv("ignore/radio_data_processed_Jan.txt", sep = '\t', index = False)
+# read January 2024 data and relevant columns from Parquet store
+# (categorical Area/Node and float32 metrics, see compact.py)
+with stage('read_store') as rec:
+    df = read_store(columns = ['Area', 'Node', 'Time'] + metrics_all, months = ['2024-01'], compact = True)
+    rec['rows'] = len(df)
 
 # =============================================================================
-# functions
+# data preprocessing
 # =============================================================================
 
-# function to plot correlation
-def plot_correlation(cor_df, area):
-    corr = cor_df.corr() # compute correlation
-    
-    # plot correlation heatmap
-    fig = plt.figure()
-    ax = fig.add_subplot(111)
-    cax = ax.matshow(corr, cmap = 'coolwarm', vmin = -1, vmax = 1)
-    fig.colorbar(cax)
-    ticks = np.arange(0, len(cor_df.columns), 1)
-    ax.set_xticks(ticks)
-    plt.xticks(rotation = 90)
-    ax.set_yticks(ticks)
-    ax.set_xticklabels(cor_df.columns)
-    ax.set_yticklabels(cor_df.columns)
-    
-    for i in range(len(cor_df.columns)):
-        for j in range(len(cor_df.columns)):
-            text = f"{corr.iloc[i, j]:.2f}"
-            ax.text(j, i, text, ha = 'center', va = 'center', color = 'black', fontsize = 6)
-            
-    plt.title(f"{area}", fontweight = 'bold')
-    
-    output_path = os.path.join("output/correlation_heatmap_202401_" + area + '.png')
-    plt.savefig(output_path, dpi = 1200, bbox_inches = 'tight')
-    plt.show()
-
-# function to summarize statistics of perf metrics
-def perf_metrics_summary(metric):
-    # compute mean, st dev, and median
-    xdf = df.groupby(['Area', 'Node'])[metric].agg(
-        Mean = 'mean',
-        Std = 'std',
-        Median = 'median'
-    ).reset_index()
-    
-    # add metric as varible
-    xdf['Metric'] = metric
-    
-    return xdf
+# convert time to datetime
+df.Time = pd.to_datetime(df.Time) # convert to pandas datetime
+
+# upstream mesh topology of every hour (downstream nodes of a router, path latency to gateway)
+with stage('topology') as rec:
+    topology = TopologyIndex(read_store(columns = ['Node', 'Time', 'Next Hop Upstream Router', 'Hop Count', 'Latency (ms)'],
+                                        months = ['2024-01']))
+    rec['rows'] = len(topology.hours)
+# topology.downstream('Greenway Rd & 64th St', '2024-01-15 08:00')
+# topology.path_latency('Thunderbird Rd & 70th St HAWK', '2024-01-15 08:00')
+
+# check data availability for each node (hourly coverage index written at ingest, see coverage.py)
+with stage('coverage') as rec:
+    coverage = CoverageIndex.load("ignore/radio_data_processed/coverage.npz")
+    cov_df = coverage.coverage(start = '2024-01-01', end = '2024-02-01')
+    gap_df = coverage.gaps(start = '2024-01-01', end = '2024-02-01', min_slots = 3)
+    rec['rows'] = len(cov_df)
+print(cov_df.sort_values('Coverage (%)').head(10))
+print(gap_df.sort_values('Slots', ascending = False).head(10))
+# coverage.missing(hours = 24) # nodes without data in the last 24 hours of the index
+
+# calendar features of every hour (January 2024 is already selected by the month partition of the store)
+with stage('calendar_features', rows = len(df)):
+    calendar = CalendarIndex.covering(df.Time)
+
+    # classify hours into 4 peaks (categorical codes gathered from the calendar)
+    df.insert(3, 'Peak', calendar.peak(df.Time))
+
+# df.to_csv("ignore/radio_data_processed_Jan.txt", sep = '\t', index = False)
 
 # =============================================================================
 # correlation analysis
 # =============================================================================
 
+# running sums of metrics by area, node and month (can be saved and updated with new data)
+with stage('correlation', rows = len(df)):
+    cube = CorrelationCube(metrics_all).update(df)
+# cube.save("ignore/correlation_cube.npz")
+
+# figures are collected as jobs and exported together at the end
+figure_jobs = []
+
 # correlation in all study areas
-cor_df = df.copy()[metrics_all]
-# plot_correlation(cor_df, 'All Study Areas')
+cor_all = cube.corr()
+figure_jobs.append(correlation_job(cor_all, 'All Study Areas', "output/correlation_heatmap_202401_All Study Areas.png"))
 
 # correlation by study areas
-for area in list(df.Area.unique()):
-    cor_df_area = df.copy()[metrics_all][df.Area == area]
-    # plot_correlation(cor_df_area, area)
+for area in df.Area.cat.categories:
+    cor_area = cube.corr(Area = [area])
+    figure_jobs.append(correlation_job(cor_area, area, "output/correlation_heatmap_202401_" + area + '.png'))
 
 # =============================================================================
 # spatiotemporal analysis
 # =============================================================================
 
 # list of nodes in each study area
-area_K = list(df[df.Area == 'Kierland'].Node.unique())
-area_T = list(df[df.Area == 'Thomas'].Node.unique())
-area_S = list(df[df.Area == 'Southwest'].Node.unique())
+area_K = list(df.Node[df.Area == 'Kierland'].unique())
+area_T = list(df.Node[df.Area == 'Thomas'].unique())
+area_S = list(df.Node[df.Area == 'Southwest'].unique())
 
 # specify plotting order
 order_day = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
-order_peak = ['Morning', 'Mid-day', 'Evening', 'Night']
+order_peak = peak_names
 order_area = ['Kierland', 'Thomas', 'Southwest']
 order_node = area_K + area_T + area_S
 
 # upload speed by study area
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = 'Upload (Mbps)',
@@ -153,7 +124,7 @@ px.box(
 ).show()
 
 # upload speed by study area and peak
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = 'Upload (Mbps)',
@@ -162,7 +133,7 @@ px.box(
 ).show()
 
 # download speed by study area and peak
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = 'Download (Mbps)',
@@ -171,7 +142,7 @@ px.box(
 ).show()
 
 # latency by study area
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = 'Latency (ms)',
@@ -185,7 +156,7 @@ px.box(
 ).show()
 
 # packet loss by study area
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = 'Packet Loss',
@@ -199,22 +170,12 @@ px.box(
 ).show()
 
 
-list_perf_df = [] # store stats of performance metrics in a list
-
-# loop through each metric and store resulting statistics
-for metric in perf_metrics:
-    list_perf_df.append(perf_metrics_summary(metric))
-
-# combine summary df from list    
-pdf = pd.concat(list_perf_df, ignore_index = True)
+# summary statistics (mean, st dev, median, p5, p95, p99) of all metrics in one grouped pass
+with stage('summarize', rows = len(df)):
+    sdf = summarize_metrics(df, perf_metrics + env_metrics + util_metrics, quantiles = (0.05, 0.95, 0.99))
 
-# round statistics
-pdf[['Mean', 'Std', 'Median']] = pdf[['Mean', 'Std', 'Median']].round(2)
-
-# pivot wider and rename columns
-pdf = pdf.pivot_table(index = ['Area', 'Node'], columns = 'Metric', values = ['Mean', 'Std', 'Median'], aggfunc = 'first')
-pdf.columns = ['{}_{}'.format(stat, metric) for stat, metric in pdf.columns]
-pdf.reset_index(inplace = True)
+# summary statistics of performance metrics
+pdf = select_metrics(sdf, perf_metrics)
 
 # save summary statistics of performance metrics
 # pdf.to_csv("ignore/radio_data_perf_summary.csv", index = False)
@@ -223,54 +184,33 @@ pdf.reset_index(inplace = True)
 # impact of environmental factors
 # =============================================================================
 
-env_metrics = ['2.4 GHz Noise', '5.8 GHz Noise', 'Hop Count']
-list_env_df = [] # store stats of network utilization in a list
-
-# loop through each metric and store resulting statistics
-for metric in env_metrics:
-    list_env_df.append(perf_metrics_summary(metric))
-    
-# combine summary df from list    
-edf = pd.concat(list_env_df, ignore_index = True)
-
-# round statistics
-edf[['Mean', 'Std', 'Median']] = edf[['Mean', 'Std', 'Median']].round(2)
-
-# pivot wider and rename columns
-edf = edf.pivot_table(index = ['Area', 'Node'], columns = 'Metric', values = ['Mean', 'Std', 'Median'], aggfunc = 'first')
-edf.columns = ['{}_{}'.format(stat, metric) for stat, metric in edf.columns]
-edf.reset_index(inplace = True)
+# summary statistics of environmental factors
+edf = select_metrics(sdf, env_metrics)
 
 # save summary statistics of environmental factors
 # edf.to_csv("ignore/radio_data_env_summary.csv", index = False)
 
+# nodes in the same area and hour on the same or overlapping channels (per band)
+with stage('interference') as rec:
+    odf = channel_overlaps(read_store(columns = interference_cols, months = ['2024-01'], compact = True))
+    rec['rows'] = len(odf)
+
+# mean noise, airtime and throughput by number of overlapping nodes, and their correlation
+ovdf = relate_overlaps(odf)
+ocdf = overlap_correlation(odf)
+
 # =============================================================================
 # efficiency of network resources
 # =============================================================================
 
-util_metrics = ['Tx Rate (Kbps)', 'Rx Rate (Kbps)', '2.4 GHz Airtime Total', '5.8 GHz Airtime Total']
-list_util_df = [] # store stats of network utilization in a list
-
-# loop through each metric and store resulting statistics
-for metric in util_metrics:
-    list_util_df.append(perf_metrics_summary(metric))
-    
-# combine summary df from list    
-udf = pd.concat(list_util_df, ignore_index = True)
-
-# round statistics
-udf[['Mean', 'Std', 'Median']] = udf[['Mean', 'Std', 'Median']].round(2)
-
-# pivot wider and rename columns
-udf = udf.pivot_table(index = ['Area', 'Node'], columns = 'Metric', values = ['Mean', 'Std', 'Median'], aggfunc = 'first')
-udf.columns = ['{}_{}'.format(stat, metric) for stat, metric in udf.columns]
-udf.reset_index(inplace = True)
+# summary statistics of utilization metrics
+udf = select_metrics(sdf, util_metrics)
 
 # save summary statistics of utilization metrics
 # udf.to_csv("ignore/radio_data_util_summary.csv", index = False)
 
 # airtime usage by node and peak
-px.box(
+box_plot(
     df,
     x = 'Node',
     y = '2.4 GHz Airtime Total',
@@ -282,59 +222,41 @@ px.box(
 # anomaly detection using Isolation Forest
 # =============================================================================
 
-# drop rows with missing values
-idf = df.copy()
-idf.dropna(inplace = True)
+# drop rows with missing values (a separate frame, the anomaly columns are added to it)
+idf = df.dropna().copy()
 
 # initialize model
 isolation_forest = IsolationForest(contamination = 0.01, random_state = 42)
 
 # fit model
-isolation_forest.fit(idf[perf_metrics])
+with stage('anomaly_fit', rows = len(idf)):
+    isolation_forest.fit(idf[perf_metrics])
 
 # predict anomalies
-idf['anomaly_score'] = isolation_forest.predict(idf[perf_metrics])
+with stage('anomaly_predict', rows = len(idf)):
+    idf['anomaly_score'] = isolation_forest.predict(idf[perf_metrics])
 
 # mark anomalies (anomaly score = -1) and normal points (anomaly_score = 1)
 idf['is_anomaly'] = idf['anomaly_score'] == -1
 
-for area in list(idf.Area.unique()):
-    # filter for study area
-    idf_area = idf.copy()[idf.Area == area]
-    
-    # normal points and anomalies
-    normal_points = idf_area[idf_area['is_anomaly'] == False]
-    anomalies = idf_area[idf_area['is_anomaly'] == True]
+# plotted columns as arrays, each study area takes its rows by position (no frame copies)
+upload = idf['Upload (Mbps)'].to_numpy()
+latency = idf['Latency (ms)'].to_numpy()
+is_anomaly = idf['is_anomaly'].to_numpy()
 
+for area, rows in idf.groupby('Area', observed = True).indices.items():
     # plot normal points and anomalies
-    plt.figure()
-    
-    plt.scatter(
-        normal_points['Upload (Mbps)'],
-        normal_points['Latency (ms)'],
-        c = 'green',
-        label = 'Normal',
-        alpha = 0.7,
-        edgecolors = 'w',
-        s = 30
-    )
-    
-    plt.scatter(
-        anomalies['Upload (Mbps)'],
-        anomalies['Latency (ms)'],
-        c = 'red',
-        label = 'Anomaly',
-        alpha = 0.7,
-        edgecolors = 'w',
-        s = 30
-    )
-    
-    # titles and labels
-    plt.title(f"{area}", fontweight = 'bold')
-    plt.xlabel('Upload (Mbps)')
-    plt.ylabel('Latency (ms)')
-    plt.legend()    
-    
     output_path = os.path.join("output/anomaly_detection_202401_" + area + '.png')
-    plt.savefig(output_path, dpi = 1200, bbox_inches = 'tight')
-    plt.show()
+    figure_jobs.append(anomaly_job(upload[rows], latency[rows], is_anomaly[rows],
+                                   area, 'Upload (Mbps)', 'Latency (ms)', output_path))
+
+# =============================================================================
+# export figures
+# =============================================================================
+
+# render figures in parallel worker processes (figures with unchanged inputs are skipped)
+with stage('render', figures = len(figure_jobs)):
+    export_figures(figure_jobs)
+
+# wall/CPU time, peak memory and rows of each stage (ignore/run_logs)
+save_run_log('performance_analysis')
\ No newline at end of file
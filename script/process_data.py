@@ -1,6 +1,8 @@
 import os
-import numpy as np
-import pandas as pd
+
+from ingest import update_processed, read_outputs
+from radio_store import store_path, write_store, window_partitions, replace_partitions, compact_partitions
+from instrument import stage, save_run_log
 
 os.chdir(r"D:\GitHub\wireless_communication")
 
@@ -8,57 +10,32 @@ os.chdir(r"D:\GitHub\wireless_communication")
 folders = ["ignore/radio_data_20231226_20240125", 
            "ignore/radio_data_20240403_20240503"]
 
-# list of column names
-cols = ['Time', 'Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)',
-       'Packet Loss', '2.4 GHz Noise', '5.8 GHz Noise', '2.4 GHz Airtime TX',
-       '2.4 GHz Airtime RX', '2.4 GHz Airtime Total',
-       '5.8 GHz Airtime TX', '5.8 GHz Airtime RX',
-       '5.8 GHz Airtime Total', 'PSP', 'RPSP', 'Tx Rate (Kbps)',
-       'Rx Rate (Kbps)', '5.8 GHz Tx Rate (Kbps)', '5.8 GHz Rx Rate (Kbps)',
-       '2.4 GHz Routed Clients', '5.8 GHz Routed Clients', 'Neighbors',
-       'Hop Count', '2.4 GHz Channel', '5.8 GHz Channel',
-       'Next Hop Upstream Router']
-
-list_df = [] # initialize empty list to store raw data from each node
-
-# loop through each folder
-for folder in folders:
-    print(f"\nFolder: {folder}")
-    files = os.listdir(folder) # list of files in folder
+# output folder of processed data (processed rows of each export file)
+output_dir = "ignore/radio_data_processed"
+
+# the guard is required for the process pool to spawn workers on Windows
+if __name__ == '__main__':
+    # read new or changed node files in parallel, processed rows of each file are kept in output_dir
+    # (file paths, sizes and mtimes are tracked in radio_data_processed/manifest.json,
+    #  hourly coverage of each node in radio_data_processed/coverage.npz, see coverage.py)
+    with stage('update_processed') as rec:
+        df, windows = update_processed(folders, output_dir)
+        rec['rows'] = len(df)
     
-    # loop through each file in folder
-    for file in files:
-        print(f"File: {file}")
-        file_path = os.path.join(folder, file)
-        
-        # check whether the file ends in .csv or .xlsx
-        # these extensions have different formatting styles for the header
-        if file.endswith('.csv'):
-            data = pd.read_csv(file_path, header = None, names = cols, skiprows = 1)
-            node = file[:-4]
-        elif file.endswith('.xlsx'):
-            data = pd.read_excel(file_path, sheet_name = 'Sheet1', header = None, names = cols, skiprows = 2)
-            node = file[:-5]
-        
-        # add node/intersection name as variable and append data to list
-        data['Node'] = node
-        list_df.append(data)
-
-df = pd.concat(list_df, ignore_index = True)
-
-# filter out data from December 2023 (due to holidays)
-df = df[~df.Time.str.contains('Dec')]
-
-# convert time to datetime
-df.Time = '2024 ' + df.Time.str[:9]
-df.Time = pd.to_datetime(df.Time, format = '%Y %b %d %H')
-
-# add study area
-df['Area'] = np.select([df.Node.str.contains('Greenway|Thunderbird'), 
-                        df.Node.str.contains('Indian School|Osborn|Thomas'), 
-                        df.Node.str.contains('Van Buren|Buckeye')], 
-                       ['Kierland', 'Thomas', 'Southwest'])
-
-# save file
-output_path = "ignore/radio_data_processed.txt"
-df.to_csv(output_path, index = False, sep = '\t')
\ No newline at end of file
+    # write typed Parquet store partitioned by Area, Node and month
+    # only partitions of rows added or dropped in this run are rewritten (the whole store if it is missing),
+    # files appended by collector.py are kept
+    with stage('write_store') as rec:
+        if os.path.exists(store_path):
+            rec['rows'] = replace_partitions(df, window_partitions(windows))
+        else:
+            df = read_outputs(output_dir)
+            write_store(df)
+            rec['rows'] = len(df)
+
+    # merge files appended by the collector into one file per partition
+    with stage('compact_store') as rec:
+        rec['files'] = compact_partitions()
+    
+    # wall/CPU time, peak memory and rows of each stage (ignore/run_logs)
+    save_run_log('process_data')
\ No newline at end of file
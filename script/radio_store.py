@@ -0,0 +1,162 @@
+import os
+import uuid
+import shutil
+from urllib.parse import unquote
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from ingest import cols, area_of
+from compact import compact_frame
+
+# =============================================================================
+# columnar Parquet store of processed radio data
+# =============================================================================
+
+# default location of the store
+store_path = "ignore/radio_data_store"
+
+# partition columns (YearMonth is derived from Time, e.g. '2024-01')
+partition_cols = ['Area', 'Node', 'YearMonth']
+
+# file names in a partition: files appended by the collector start with append_prefix,
+# files written from processed data use ingest_template (only these are replaced on ingest)
+append_prefix = 'part-'
+ingest_template = 'ingest-{i}.parquet'
+
+# columns kept as strings, all other radio metrics are stored as float
+cols_string = ['2.4 GHz Channel', '5.8 GHz Channel', 'Next Hop Upstream Router']
+cols_float = [col for col in cols if col != 'Time' and col not in cols_string]
+
+# typed schema of the stored columns
+schema = pa.schema(
+    [pa.field('Time', pa.timestamp('ns'))] +
+    [pa.field(col, pa.float64()) for col in cols_float] +
+    [pa.field(col, pa.string()) for col in cols_string] +
+    [pa.field(col, pa.string()) for col in partition_cols]
+)
+
+# function to convert processed dataframe to the typed store layout
+def to_store_frame(df):
+    sdf = pd.DataFrame({'Time': pd.to_datetime(df.Time)})
+    for col in cols_float:
+        sdf[col] = df[col].astype(float)
+    for col in cols_string:
+        sdf[col] = df[col].astype('string')
+    sdf['Area'] = df['Area'].astype(str)
+    sdf['Node'] = df['Node'].astype(str)
+    sdf['YearMonth'] = sdf.Time.dt.strftime('%Y-%m')
+
+    return sdf
+
+# function to list partition directories of the store, (Area, Node, YearMonth) -> directory
+def list_partitions(root = store_path):
+    partitions = {}
+    for dirpath, _, _ in os.walk(root):
+        parts = os.path.relpath(dirpath, root).split(os.sep)
+        if len(parts) == len(partition_cols) and all('=' in part for part in parts):
+            partitions[tuple(unquote(part.split('=', 1)[1]) for part in parts)] = dirpath
+
+    return partitions
+
+# function to delete ingested files of partitions (files appended by the collector are kept)
+def delete_partitions(keys, root = store_path):
+    partitions = list_partitions(root)
+    for key in keys:
+        path = partitions.get(tuple(key))
+        if path is None:
+            continue
+        for file in os.listdir(path):
+            if not file.startswith(append_prefix):
+                os.remove(os.path.join(path, file))
+
+# function to write processed data as Parquet partitioned by Area, Node and month
+# overwrite = False replaces only the ingested files of the partitions present in df
+# append adds new files next to the existing ones of each partition (e.g. batches of polled data)
+def write_store(df, root = store_path, overwrite = True, append = False):
+    if overwrite and not append and os.path.exists(root):
+        shutil.rmtree(root)
+
+    sdf = to_store_frame(df)
+    if append:
+        template = f"{append_prefix}{uuid.uuid4().hex}-{{i}}.parquet"
+    else:
+        delete_partitions(sdf[partition_cols].drop_duplicates().itertuples(index = False, name = None), root)
+        template = ingest_template
+
+    table = pa.Table.from_pandas(sdf, schema = schema, preserve_index = False)
+    pq.write_to_dataset(table, root, partition_cols = partition_cols, basename_template = template,
+                        existing_data_behavior = 'overwrite_or_ignore')
+
+# function to list partitions (Area, Node, YearMonth) overlapping node time windows (Node, Start, End)
+def window_partitions(windows):
+    keys = set()
+    for node, start, end in windows[['Node', 'Start', 'End']].itertuples(index = False):
+        area = area_of([node])[0]
+        for month in pd.period_range(pd.Timestamp(start), pd.Timestamp(end), freq = 'M'):
+            keys.add((area, node, str(month)))
+
+    return keys
+
+# function to replace the ingested files of partitions with the rows of df in them
+# partitions without rows in df are emptied (e.g. rows of removed export files)
+def replace_partitions(df, keys, root = store_path):
+    keys = set(keys)
+    if not keys:
+        return 0
+    delete_partitions(keys, root)
+    months = pd.to_datetime(df.Time).dt.strftime('%Y-%m')
+    rows = pd.MultiIndex.from_arrays([df.Area.astype(str), df.Node.astype(str), months]).isin(list(keys))
+    if rows.any():
+        write_store(df[rows], root, overwrite = False)
+
+    return int(rows.sum())
+
+# function to merge the appended files of each partition into one file (sorted by Time)
+# the new file is written before the merged ones are removed, files appended meanwhile are kept
+def compact_partitions(root = store_path, min_files = 2):
+    merged = 0
+    for path in list_partitions(root).values():
+        files = sorted(file for file in os.listdir(path) if file.startswith(append_prefix))
+        if len(files) < min_files:
+            continue
+        table = pa.concat_tables([pq.read_table(os.path.join(path, file)) for file in files])
+        table = table.sort_by('Time')
+        pq.write_table(table, os.path.join(path, f"{append_prefix}{uuid.uuid4().hex}-0.parquet"))
+        for file in files:
+            os.remove(os.path.join(path, file))
+        merged += len(files)
+
+    return merged
+
+# function to read processed data with column projection and partition pruning
+# compact returns string dimensions as categoricals and float32 metrics (see compact.py)
+def read_store(root = store_path, columns = None, areas = None, nodes = None, months = None, compact = False):
+    # filters on partition columns skip whole directories of the store
+    filters = []
+    if areas is not None:
+        filters.append(('Area', 'in', list(areas)))
+    if nodes is not None:
+        filters.append(('Node', 'in', list(nodes)))
+    if months is not None:
+        filters.append(('YearMonth', 'in', list(months)))
+
+    table = pq.read_table(root, columns = columns, filters = filters or None,
+                          partitioning = 'hive')
+
+    # strings are decoded once per distinct value when compact
+    df = table.to_pandas(strings_to_categorical = compact)
+
+    # partition values are read as categoricals, return them as plain strings unless compact
+    if not compact:
+        for col in partition_cols:
+            if col in df.columns:
+                df[col] = df[col].astype(str)
+
+    # drop the derived month partition unless it was requested
+    if columns is None:
+        df = df.drop(columns = 'YearMonth')
+    else:
+        df = df[columns]
+
+    return compact_frame(df) if compact else df
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# single-pass multi-metric summary statistics
+# =============================================================================
+
+# quantile statistics and their column names
+quantile_names = {0.05: 'P5', 0.25: 'P25', 0.75: 'P75', 0.95: 'P95', 0.99: 'P99'}
+
+# function to compute quantiles from group segments of sorted values
+# (linear interpolation, same as pandas quantile)
+def segment_quantile(values, starts, counts, q):
+    pos = starts + q * np.maximum(counts - 1, 0)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.ceil(pos).astype(np.int64)
+    frac = pos - lo
+
+    # empty groups point at a valid index and are set to nan afterwards
+    lo = np.minimum(lo, len(values) - 1)
+    hi = np.minimum(hi, len(values) - 1)
+    result = values[lo] + (values[hi] - values[lo]) * frac
+
+    return np.where(counts > 0, result, np.nan)
+
+# function to summarize metrics by group in one pass over the data
+# returns a wide table with columns such as Mean_<metric>, Std_<metric>, P95_<metric>
+def summarize_metrics(df, metrics, by = ['Area', 'Node'], quantiles = (), decimals = 2):
+    # integer group codes (rows with missing keys are excluded as in groupby)
+    grouped = df.groupby(by, sort = True, observed = True)
+    codes = grouped.ngroup().to_numpy()
+    keys = grouped.size().index
+    n_groups = len(keys)
+
+    keep = codes >= 0
+    codes = codes[keep]
+
+    # group segments of the rows after sorting by group code
+    sizes = np.bincount(codes, minlength = n_groups)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    stats = {}
+    for metric in metrics:
+        values = df[metric].to_numpy(dtype = float)[keep]
+        valid = ~np.isnan(values)
+
+        # count, mean and standard deviation (ddof = 1) from sums
+        count = np.bincount(codes, weights = valid, minlength = n_groups)
+        total = np.bincount(codes[valid], weights = values[valid], minlength = n_groups)
+        with np.errstate(invalid = 'ignore', divide = 'ignore'):
+            mean = total / count
+            dev = values[valid] - mean[codes[valid]]
+            ss = np.bincount(codes[valid], weights = dev * dev, minlength = n_groups)
+            std = np.sqrt(ss / (count - 1))
+        std[count < 2] = np.nan
+
+        # sort values within groups (nan values sort to the end of each group)
+        order = np.lexsort((values, codes))
+        sorted_values = values[order]
+
+        stats[f'Mean_{metric}'] = mean
+        stats[f'Std_{metric}'] = std
+        stats[f'Median_{metric}'] = segment_quantile(sorted_values, starts, count, 0.5)
+        for q in quantiles:
+            name = quantile_names.get(q, f'P{q * 100:g}')
+            stats[f'{name}_{metric}'] = segment_quantile(sorted_values, starts, count, q)
+
+    sdf = pd.DataFrame(stats, index = keys)
+    if decimals is not None:
+        sdf = sdf.round(decimals)
+
+    return sdf.reset_index()
+
+# function to select summary columns of some metrics from a wide summary table
+def select_metrics(sdf, metrics, by = ['Area', 'Node']):
+    cols = [col for col in sdf.columns if col.split('_', 1)[-1] in metrics]
+
+    return sdf[by + cols]
@@ -0,0 +1,161 @@
+import os
+import numpy as np
+import pandas as pd
+
+from ingest import cols
+
+# =============================================================================
+# synthetic radio data in the formats of the vendor exports
+# =============================================================================
+
+# node name templates of each study area (matching the area keywords of ingest.process_node_data)
+area_templates = {'Kierland': 'Greenway Rd & Node {}',
+                  'Thomas': 'Thomas Rd & Node {}',
+                  'Southwest': 'Van Buren St & Node {}'}
+
+# two-line headers of the radio xlsx exports (name, unit), e.g. 'Up' / '(Mbps)'
+xlsx_headers = {'Upload (Mbps)': ('Up', '(Mbps)'), 'Download (Mbps)': ('Down', '(Mbps)'),
+                'Latency (ms)': ('Latency', '(ms)'), 'Tx Rate (Kbps)': ('Tx Rate', '(Kbps)'),
+                'Rx Rate (Kbps)': ('Rx Rate', '(Kbps)'), '5.8 GHz Tx Rate (Kbps)': ('5.8 GHz Tx Rate', '(Kbps)'),
+                '5.8 GHz Rx Rate (Kbps)': ('5.8 GHz Rx Rate', '(Kbps)')}
+
+# link sheets of the Intuicom workbook (as in process_after_data.py)
+intuicom_sheets = ["Link 1 Bell-Greenway on 64th",
+                   "Link2-Greenway-Thunderbird-64th",
+                   "Link 3- 64th-70th on Thunerbird"]
+
+# function to build names of n nodes spread over the study areas
+def node_names(n_nodes):
+    areas = list(area_templates)
+
+    return [area_templates[areas[i % len(areas)]].format(i + 1) for i in range(n_nodes)]
+
+# function to generate hourly radio metrics of one node (columns of ingest.cols, Time as datetime)
+def radio_metrics(times, rng):
+    n = len(times)
+    hour = times.hour.to_numpy()
+    busy = ((hour >= 6) & (hour < 19)).astype(float)
+
+    data = {'Time': times}
+    data['Upload (Mbps)'] = np.round(rng.gamma(4, 5, n) * (1 - 0.3 * busy), 2)
+    data['Download (Mbps)'] = np.round(rng.gamma(4, 8, n) * (1 - 0.3 * busy), 2)
+    data['Latency (ms)'] = np.round(rng.gamma(2, 4, n) * (1 + 0.5 * busy), 2)
+    data['Packet Loss'] = np.round(rng.beta(1, 80, n), 4)
+    data['2.4 GHz Noise'] = rng.integers(-98, -80, n).astype(float)
+    data['5.8 GHz Noise'] = rng.integers(-100, -85, n).astype(float)
+    for band in ['2.4 GHz', '5.8 GHz']:
+        tx = rng.uniform(0, 40, n) * (1 + busy)
+        rx = rng.uniform(0, 40, n) * (1 + busy)
+        data[f'{band} Airtime TX'] = np.round(tx, 1)
+        data[f'{band} Airtime RX'] = np.round(rx, 1)
+        data[f'{band} Airtime Total'] = np.round(tx + rx, 1)
+    data['PSP'] = rng.integers(0, 100, n).astype(float)
+    data['RPSP'] = rng.integers(0, 100, n).astype(float)
+    data['Tx Rate (Kbps)'] = rng.integers(20_000, 300_000, n).astype(float)
+    data['Rx Rate (Kbps)'] = rng.integers(20_000, 300_000, n).astype(float)
+    data['5.8 GHz Tx Rate (Kbps)'] = rng.integers(50_000, 800_000, n).astype(float)
+    data['5.8 GHz Rx Rate (Kbps)'] = rng.integers(50_000, 800_000, n).astype(float)
+    data['2.4 GHz Routed Clients'] = rng.integers(0, 5, n).astype(float)
+    data['5.8 GHz Routed Clients'] = np.zeros(n)
+    data['Neighbors'] = rng.integers(1, 8, n).astype(float)
+    data['Hop Count'] = rng.integers(1, 4, n).astype(float)
+    data['2.4 GHz Channel'] = rng.choice([1, 6, 11], n).astype(str)
+    data['5.8 GHz Channel'] = rng.choice([149, 153, 157, 161, 165], n).astype(str)
+    data['Next Hop Upstream Router'] = np.array([f'10.0.{i}.1' for i in rng.integers(0, 4, n)])
+
+    # sparse missing values as in the exports
+    for col in ['Upload (Mbps)', 'Download (Mbps)', 'Latency (ms)', 'Packet Loss']:
+        data[col][rng.random(n) < 0.002] = np.nan
+
+    return pd.DataFrame(data)[cols]
+
+# function to generate processed radio data in memory (Area, Node, Time and metrics)
+def processed_frame(n_nodes = 15, days = 31, start = '2024-01-01', seed = 42):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods = days * 24, freq = 'h')
+    areas = list(area_templates)
+
+    list_df = []
+    for i, node in enumerate(node_names(n_nodes)):
+        data = radio_metrics(times, rng)
+        data['Node'] = node
+        data['Area'] = areas[i % len(areas)]
+        list_df.append(data)
+
+    return pd.concat(list_df, ignore_index = True)
+
+# function to write a radio export folder (radio_data_YYYYMMDD_YYYYMMDD) with one file per node
+# csv files have a one-line header, xlsx files a two-line header in Sheet1 (as read by ingest.read_node_file)
+def write_radio_folder(root, n_nodes = 15, days = 31, start = '2024-01-01', fmt = 'csv', seed = 42):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods = days * 24, freq = 'h')
+    folder = os.path.join(root, f"radio_data_{times[0]:%Y%m%d}_{times[-1]:%Y%m%d}")
+    os.makedirs(folder, exist_ok = True)
+
+    for node in node_names(n_nodes):
+        data = radio_metrics(times, rng)
+        data['Time'] = times.strftime('%b %d %H:%M')
+        if fmt == 'csv':
+            data.to_csv(os.path.join(folder, f"{node}.csv"), index = False)
+        else:
+            names = [xlsx_headers.get(col, (col, None)) for col in cols]
+            header = pd.DataFrame([[name for name, unit in names], [unit for name, unit in names]], columns = cols)
+            pd.concat([header, data.astype(object)], ignore_index = True).to_excel(
+                os.path.join(folder, f"{node}.xlsx"), sheet_name = 'Sheet1', header = False, index = False)
+
+    return folder
+
+# function to write an Intuicom workbook with one 15-min link sheet per node (two title rows above the header)
+def write_intuicom_workbook(path, sheets = intuicom_sheets, days = 7, start = '2025-03-12', seed = 42):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods = days * 96, freq = '15min')
+    n = len(times)
+
+    with pd.ExcelWriter(path) as writer:
+        for sheet in sheets:
+            packets_rx = rng.integers(5_000, 50_000, n)
+            packets_tx = rng.integers(5_000, 50_000, n)
+            data = pd.DataFrame({
+                'Date-Time': times.strftime('%Y.%m.%d-%H.%M.%S'),
+                'EpochByteRx': packets_rx * rng.integers(200, 1400, n),
+                'EpochByteTx': packets_tx * rng.integers(200, 1400, n),
+                'EpochPacketRx': packets_rx,
+                'EpochPacketTx': packets_tx,
+                'EpochDropRx': rng.poisson(20, n),
+                'EpochDropTx': rng.poisson(20, n),
+                'EpochQDropTx': rng.poisson(5, n),
+                'AvgLatency (ms)': np.round(rng.gamma(2, 3, n), 1).astype(object)
+            })
+            data.loc[rng.random(n) < 0.01, 'AvgLatency (ms)'] = 'No Data'
+
+            title = pd.DataFrame([[sheet] + [None] * (data.shape[1] - 1), [None] * data.shape[1]],
+                                 columns = data.columns)
+            pd.concat([title, data.columns.to_frame().T, data], ignore_index = True).to_excel(
+                writer, sheet_name = sheet, header = False, index = False)
+
+    return path
+
+# function to write Encom "Wireless Link Log" CSVs with per-second rows of each link
+def write_encom_logs(folder, nodes, hours = 2, start = '2025-03-26 09:00', files = 1, seed = 42):
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder, exist_ok = True)
+
+    paths = []
+    for f in range(files):
+        times = pd.date_range(pd.Timestamp(start) + pd.Timedelta(hours = hours * f), periods = hours * 3600, freq = 's')
+        n = len(times)
+        data = pd.concat([pd.DataFrame({
+            'Date': times.strftime('%m/%d/%Y'),
+            'Time': times.strftime('%H:%M:%S'),
+            'Source Name': node,
+            'Dest Name': 'Gateway',
+            'Tx Rate (Mbps)': np.round(rng.normal(150, 20, n), 1),
+            'Rx Rate (Mbps)': np.round(rng.normal(150, 20, n), 1),
+            'Tx CCQ (%)': rng.integers(80, 101, n),
+            'Rx CCQ (%)': rng.integers(80, 101, n)
+        }) for node in nodes], ignore_index = True)
+        path = os.path.join(folder, f"{times[0]:%Y-%m-%d - %H-%M-%S} - Wireless Link Log.csv")
+        data.to_csv(path, index = False)
+        paths.append(path)
+
+    return paths
@@ -0,0 +1,75 @@
+import re
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# vectorized parser for the vendor "Mon DD HH" time format
+# =============================================================================
+
+# month tokens packed as 3-byte integers (e.g. b'Jan') and their month numbers
+month_tokens = [b'Jan', b'Feb', b'Mar', b'Apr', b'May', b'Jun',
+                b'Jul', b'Aug', b'Sep', b'Oct', b'Nov', b'Dec']
+month_keys = np.array([(t[0] << 16) | (t[1] << 8) | t[2] for t in month_tokens])
+month_order = np.argsort(month_keys)
+month_keys_sorted = month_keys[month_order]
+month_values_sorted = month_order + 1
+
+# longest day of each month (index 0 for unknown months, February 29 is checked against the year later)
+month_days = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+# function to read start and end dates from an export folder name
+# e.g. ignore/radio_data_20231226_20240125 -> (2023-12-26, 2024-01-25)
+def export_date_range(path):
+    match = re.search(r'(\d{8})_(\d{8})', path)
+    if match is None:
+        raise ValueError(f"No export date range in path: {path}")
+    start, end = (pd.Timestamp(d) for d in match.groups())
+
+    return start, end
+
+# function to split "Mon DD HH" strings into integer month, day and hour arrays
+# (unknown month tokens, missing or non-text values, non-ASCII characters (e.g. non-breaking spaces)
+#  and non-digit or out-of-range day and hour get month 0, i.e. NaT)
+def split_vendor_time(times):
+    # fixed-width byte view of the first 9 characters: 'Jan 05 13'
+    # (non-text cells become empty, non-ASCII characters become '?' and fail the checks below)
+    values = pd.Series(times, dtype = object)
+    text = values.where(values.map(type) == str, '')
+    raw = text.str.encode('ascii', errors = 'replace').to_numpy().astype('S9')
+    b = raw.view(np.uint8).reshape(len(raw), 9).astype(np.int64)
+
+    # month token lookup through sorted 3-byte keys
+    key = (b[:, 0] << 16) | (b[:, 1] << 8) | b[:, 2]
+    pos = np.searchsorted(month_keys_sorted, key).clip(0, 11)
+    month = np.where(month_keys_sorted[pos] == key, month_values_sorted[pos], 0)
+
+    # two-digit day and hour from ASCII digits, separated by spaces
+    digits = b[:, [4, 5, 7, 8]] - 48
+    day = digits[:, 0] * 10 + digits[:, 1]
+    hour = digits[:, 2] * 10 + digits[:, 3]
+    valid = (((digits >= 0) & (digits <= 9)).all(axis = 1) & (b[:, 3] == 32) & (b[:, 6] == 32) &
+             (day >= 1) & (day <= month_days[month]) & (hour <= 23))
+
+    return np.where(valid, month, 0), day, hour
+
+# function to infer year of each month from the export start date
+# (months before the start month belong to the following year)
+def infer_year(month, start):
+    return np.where(month >= start.month, start.year, start.year + 1)
+
+# function to build datetime64 timestamps from integer components
+# (days past the end of the month, e.g. February 29 of a common year, are NaT)
+def vendor_timestamps(year, month, day, hour):
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    length = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(np.int64)
+    valid = (month > 0) & (day <= length)
+    days = months.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    stamps = days.astype('datetime64[ns]') + hour.astype('timedelta64[h]')
+
+    return np.where(valid, stamps, np.datetime64('NaT'))
+
+# function to parse vendor times for an export folder
+def parse_vendor_time(times, start):
+    month, day, hour = split_vendor_time(times)
+
+    return vendor_timestamps(infer_year(month, start), month, day, hour)
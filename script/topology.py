@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# time-versioned mesh topology from Next Hop Upstream Router and Hop Count
+# =============================================================================
+
+class TopologyIndex:
+    # routers (nodes and upstream routers) get integer ids, each hour keeps the upstream id of every router
+    # identical consecutive hours share one version of the parent array:
+    #   parents[v, i] = upstream id of router i in version v (-1 for gateway, or no report in that hour)
+    #   version_of[h] = version of hour h
+    # hop counts and latency are kept per hour: hops[h, i], latency[h, i]
+    def __init__(self, df, node = 'Node', time = 'Time', next_hop = 'Next Hop Upstream Router',
+                 hop_count = 'Hop Count', latency = 'Latency (ms)'):
+        xdf = df[[node, time, next_hop, hop_count] + ([latency] if latency in df.columns else [])]
+        upstream = xdf[next_hop].where(xdf[next_hop].notna(), None).astype(object)
+
+        # router ids and hours
+        self.routers = pd.Index(pd.unique(np.concatenate([xdf[node].astype(str).to_numpy(),
+                                                          upstream.dropna().astype(str).to_numpy()])))
+        hours = pd.to_datetime(xdf[time]).dt.floor('h')
+        self.hours = np.unique(hours.to_numpy())
+        n_hours, n_routers = len(self.hours), len(self.routers)
+
+        h = np.searchsorted(self.hours, hours.to_numpy())
+        i = self.routers.get_indexer(xdf[node].astype(str))
+        j = np.where(upstream.notna(), self.routers.get_indexer(upstream.fillna('').astype(str)), -1)
+        j = np.where(j == i, -1, j) # a router reporting itself as next hop is a gateway
+
+        parent = np.full((n_hours, n_routers), -1, dtype = np.int32)
+        parent[h, i] = j
+        self.hops = np.full((n_hours, n_routers), -1, dtype = np.int16)
+        self.hops[h, i] = xdf[hop_count].fillna(-1).to_numpy(np.int16)
+        self.latency = np.full((n_hours, n_routers), np.nan, dtype = np.float32)
+        if latency in xdf.columns:
+            self.latency[h, i] = xdf[latency].to_numpy(np.float32)
+
+        # keep only hours where the parent array changed
+        changed = np.ones(n_hours, dtype = bool)
+        changed[1:] = (parent[1:] != parent[:-1]).any(axis = 1)
+        self.parents = parent[changed]
+        self.version_of = (np.cumsum(changed) - 1).astype(np.int32)
+
+        # longest possible path (bounds walks up the tree, also if reports contain a cycle)
+        self.max_depth = max(int(self.hops.max(initial = 0)) + 1, 1) if n_hours else 1
+
+    # hour row of a timestamp (latest hour at or before it)
+    def hour_of(self, time):
+        h = np.searchsorted(self.hours, np.datetime64(pd.Timestamp(time), 'ns'), side = 'right') - 1
+        if h < 0:
+            raise KeyError(f"No topology before {time}")
+
+        return int(h)
+
+    # upstream array of all routers at a timestamp
+    def parent_at(self, time):
+        return self.parents[self.version_of[self.hour_of(time)]]
+
+    # routers downstream of a router at a timestamp (their path to the gateway passes through it)
+    def downstream(self, router, time):
+        parent = self.parent_at(time)
+        r = self.routers.get_loc(router)
+
+        # walk all routers up the tree at once, one level per step
+        ancestor = parent.copy()
+        below = np.zeros(len(parent), dtype = bool)
+        for _ in range(self.max_depth):
+            below |= ancestor == r
+            ancestor = np.where(ancestor >= 0, parent[np.maximum(ancestor, 0)], -1)
+            if (ancestor < 0).all():
+                break
+
+        return list(self.routers[below])
+
+    # path of a router to the gateway at a timestamp (router first)
+    def path(self, router, time):
+        parent = self.parent_at(time)
+        path = [self.routers.get_loc(router)]
+        while parent[path[-1]] >= 0 and len(path) <= self.max_depth:
+            path.append(int(parent[path[-1]]))
+
+        return list(self.routers[path])
+
+    # latency of a router to the gateway at a timestamp, with the path and each hop's share
+    # (reported latency is end to end, a hop's share is its latency minus that of its upstream router)
+    def path_latency(self, router, time):
+        h = self.hour_of(time)
+        path = self.path(router, time)
+        lat = self.latency[h, self.routers.get_indexer(path)].astype(float)
+        upstream = np.append(lat[1:], 0.0)
+
+        return {'path': path, 'latency': float(lat[0]), 'hop_latency': list(lat - np.nan_to_num(upstream)),
+                'hop_count': int(self.hops[h, self.routers.get_loc(router)])}
+
+    # save index to a compressed NumPy file
+    def save(self, path):
+        np.savez_compressed(path, routers = self.routers.to_numpy(dtype = str), hours = self.hours,
+                            parents = self.parents, version_of = self.version_of, hops = self.hops,
+                            latency = self.latency, max_depth = self.max_depth)
+
+    # load index saved with save
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle = False)
+        index = cls.__new__(cls)
+        index.routers = pd.Index(data['routers'])
+        for name in ['hours', 'parents', 'version_of', 'hops', 'latency']:
+            setattr(index, name, data[name])
+        index.max_depth = int(data['max_depth'])
+
+        return index
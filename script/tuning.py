@@ -0,0 +1,184 @@
+import os
+import json
+import random
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from model_registry import targets, xgb_params, data_fingerprint
+
+# =============================================================================
+# parallel k-fold hyperparameter search for the XGBoost regressors
+# =============================================================================
+
+# default file of partial results (one JSON line per target, candidate and fold, with the fingerprint of the data)
+results_path = "ignore/tuning_results.jsonl"
+
+# default search space around the hand-picked hyperparameters
+search_space = {
+    'n_estimators': [100, 200, 400],
+    'learning_rate': [0.05, 0.1, 0.2],
+    'max_depth': [3, 5, 7],
+    'min_child_weight': [1, 5, 10],
+    'gamma': [0, 0.1, 0.5],
+    'reg_alpha': [0, 0.5, 1],
+    'reg_lambda': [0.5, 1, 2]
+}
+
+# data shared with worker processes (set once per worker by the initializer)
+worker_data = {}
+
+# function to list all candidates of a grid search
+def param_grid(space):
+    keys = list(space)
+
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+# function to draw candidates for a random search (without repeats)
+def param_samples(space, n_iter, seed = 42):
+    grid = param_grid(space)
+    random.Random(seed).shuffle(grid)
+
+    return grid[:n_iter]
+
+# function to build key of a task, used to resume interrupted searches
+# data is the fingerprint of the target's data and folds, so results of other data or splits are not reused
+def task_key(target, params, fold, data):
+    return json.dumps([target, params, fold, data], sort_keys = True)
+
+# function to fingerprint the data and folds of each target (rows with the target, n_splits and seed)
+def fold_fingerprints(df, predictors, targets, n_splits, seed):
+    fingerprints = {}
+    for target in targets:
+        xdf = df.dropna(subset = target)
+        fingerprints[target] = data_fingerprint(xdf[predictors], xdf[target], {'n_splits': n_splits, 'seed': seed})
+
+    return fingerprints
+
+# function to read completed tasks from the results file
+def load_results(path):
+    done = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            for line in f:
+                # a line cut off by an interruption is ignored and rerun
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                done[task_key(result['target'], result['params'], result['fold'], result.get('data'))] = result
+
+    return done
+
+# function to check whether a results file ends with a complete line
+def ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+# function to set up a worker process with the arrays and folds of each target and a bounded thread count
+# (built once per worker, folds are rebuilt deterministically so every worker has the same splits)
+def init_worker(df, predictors, targets, n_splits, seed, threads_per_worker):
+    from sklearn.model_selection import KFold
+
+    # limit OpenMP threads so workers do not oversubscribe cores
+    os.environ['OMP_NUM_THREADS'] = str(threads_per_worker)
+
+    arrays = {}
+    for target in targets:
+        xdf = df.dropna(subset = target)
+        X = xdf[predictors].to_numpy(dtype = np.float32)
+        arrays[target] = (X, xdf[target].to_numpy(), list(KFold(n_splits, shuffle = True, random_state = seed).split(X)))
+    worker_data.update(arrays = arrays, threads = threads_per_worker)
+
+# function to fit and evaluate one candidate on one fold (runs in worker processes)
+def run_task(target, params, fold):
+    import xgboost as xgb
+    from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+
+    X, y, folds = worker_data['arrays'][target]
+    train_idx, test_idx = folds[fold]
+
+    xgb_model = xgb.XGBRegressor(**params, n_jobs = worker_data['threads'])
+    xgb_model.fit(X[train_idx], y[train_idx])
+    y_pred = xgb_model.predict(X[test_idx])
+
+    return {'target': target, 'params': params, 'fold': fold,
+            'mape': float(mean_absolute_percentage_error(y[test_idx], y_pred)),
+            'rmse': float(np.sqrt(mean_squared_error(y[test_idx], y_pred)))}
+
+# function to run k-fold cross-validation of all candidates for all targets in a process pool
+# completed folds are appended to results_path as they finish, so the search can be resumed
+def tune(df, candidates, targets = targets, n_splits = 5, results_path = results_path,
+         max_workers = None, threads_per_worker = 1, seed = 42):
+    predictors = [col for col in df.columns if col not in targets]
+    if max_workers is None:
+        max_workers = max(1, (os.cpu_count() or 1) // threads_per_worker)
+
+    # results of other data, splits or seeds are not reused
+    fingerprints = fold_fingerprints(df, predictors, targets, n_splits, seed)
+    done = load_results(results_path)
+    keys = {task_key(target, params, fold, fingerprints[target]): (target, params, fold)
+            for target in targets for params in candidates for fold in range(n_splits)}
+    tasks = [task for key, task in keys.items() if key not in done]
+    print(f"Tasks: {len(tasks)} to run, {len(keys) - len(tasks)} already done")
+
+    if tasks:
+        os.makedirs(os.path.dirname(results_path) or '.', exist_ok = True)
+        with ProcessPoolExecutor(max_workers = max_workers, initializer = init_worker,
+                                 initargs = (df, predictors, targets, n_splits, seed, threads_per_worker)) as executor, \
+             open(results_path, 'a') as f:
+            # start on a new line if the last run was cut off mid-line
+            if f.tell() > 0 and not ends_with_newline(results_path):
+                f.write('\n')
+            futures = [executor.submit(run_task, *task) for task in tasks]
+            for future in as_completed(futures):
+                result = future.result()
+                result['data'] = fingerprints[result['target']]
+                f.write(json.dumps(result) + '\n')
+                f.flush()
+                done[task_key(result['target'], result['params'], result['fold'], result['data'])] = result
+
+    return summarize_results([done[key] for key in keys if key in done], candidates, targets, n_splits)
+
+# function to average fold results of each target and candidate (complete candidates only)
+def summarize_results(results, candidates, targets = targets, n_splits = 5):
+    wanted = {json.dumps(params, sort_keys = True) for params in candidates}
+
+    rdf = pd.DataFrame(results)
+    rdf = rdf[rdf.target.isin(targets)]
+    rdf['candidate'] = rdf.params.map(lambda params: json.dumps(params, sort_keys = True))
+    rdf = rdf[rdf.candidate.isin(wanted)]
+
+    cv = rdf.groupby(['target', 'candidate']).agg(mape = ('mape', 'mean'), rmse = ('rmse', 'mean'),
+                                                  rmse_std = ('rmse', 'std'), folds = ('fold', 'nunique'))
+    cv = cv[cv.folds == n_splits].reset_index()
+
+    return cv.sort_values(['target', 'rmse'], ignore_index = True)
+
+# function to select the candidate with lowest mean RMSE for each target
+def best_params(cv):
+    best = cv.loc[cv.groupby('target').rmse.idxmin()]
+
+    return {row.target: json.loads(row.candidate) for row in best.itertuples()}
+
+# =============================================================================
+# random search over the default space for all targets
+# =============================================================================
+
+if __name__ == '__main__':
+    from model_registry import read_model_data, prepare_features
+
+    os.chdir(r"D:\GitHub\wireless_communication")
+
+    # read January 2024 data and prepare features as in feature_importance.py
+    df = read_model_data(months = ['2024-01'])
+    df.drop(['Node', 'Time'], axis = 1, inplace = True)
+    df = prepare_features(df)
+
+    # hand-picked hyperparameters are always evaluated alongside the random candidates
+    candidates = [xgb_params] + param_samples(search_space, n_iter = 40)
+    cv = tune(df, candidates, threads_per_worker = 2)
+    cv.to_csv("ignore/tuning_summary.csv", index = False)
+    print(best_params(cv))
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# =============================================================================
+# vendor adapters mapping raw exports to one canonical schema
+# =============================================================================
+
+# canonical columns and their types (rates and speeds in Mbps, latency in ms, packet loss and CCQ in %)
+canonical_schema = {'Area': str, 'Node': str, 'DateTime': 'datetime64[ns]',
+                    'Upload': float, 'Download': float, 'Latency': float, 'PacketLoss': float,
+                    'Tx Rate (Mbps)': float, 'Rx Rate (Mbps)': float,
+                    'Tx CCQ (%)': float, 'Rx CCQ (%)': float}
+
+# text values of missing measurements in the exports (any other text is an error)
+missing_values = ['No Data', '']
+
+# function to convert a column to float, text values of missing measurements become nan
+def to_float(values):
+    if values.dtype == object:
+        values = values.mask(values.isin(missing_values)).astype(float)
+
+    return values.to_numpy(float)
+
+# Intuicom epoch counters and their weights in Upload (Mb), Download (Mb), dropped and total packets
+intuicom_counters = ['EpochByteRx', 'EpochByteTx', 'EpochPacketRx', 'EpochPacketTx',
+                     'EpochDropRx', 'EpochDropTx', 'EpochQDropTx']
+intuicom_weights = np.array([[0, 8 / 1_000_000, 0, 0],
+                             [8 / 1_000_000, 0, 0, 0],
+                             [0, 0, 0, 1],
+                             [0, 0, 0, 1],
+                             [0, 0, 1, 1],
+                             [0, 0, 1, 1],
+                             [0, 0, 1, 1]])
+
+# function to decode Intuicom epoch counters to Upload, Download (Mbps) and PacketLoss (%)
+# in one matrix product, dropped packets are included in the total
+# missing counts and counts after a counter reset (negative) make the rates that use them nan
+def intuicom_rates(df):
+    counts = np.column_stack([to_float(df[col]) for col in intuicom_counters])
+    invalid = np.isnan(counts) | (counts < 0)
+    rates = np.where(invalid, 0, counts) @ intuicom_weights
+    rates[(invalid.astype(int) @ (intuicom_weights != 0)) > 0] = np.nan
+    with np.errstate(invalid = 'ignore', divide = 'ignore'):
+        loss = rates[:, 2] / rates[:, 3] * 100
+
+    return {'Upload': rates[:, 0], 'Download': rates[:, 1], 'PacketLoss': loss}
+
+# adapters of each vendor: time column (and format), source columns mapped to (canonical column, scale)
+# and a function deriving canonical columns from several source columns
+adapters = {
+    # generic radio export (Parquet store / processed radio data)
+    'radio': {
+        'time': 'Time',
+        'columns': {'Upload (Mbps)': ('Upload', 1), 'Download (Mbps)': ('Download', 1),
+                    'Latency (ms)': ('Latency', 1), 'Packet Loss': ('PacketLoss', 100),
+                    'Tx Rate (Kbps)': ('Tx Rate (Mbps)', 1 / 1000), 'Rx Rate (Kbps)': ('Rx Rate (Mbps)', 1 / 1000)}
+    },
+    # radio export read with flattened two-line headers (analyze_sample_data.py)
+    'radio_flat': {
+        'time': 'Time',
+        'columns': {'Up_Mbps': ('Upload', 1), 'Down_Mbps': ('Download', 1),
+                    'Latency_ms': ('Latency', 1), 'Packet_Loss': ('PacketLoss', 100)}
+    },
+    # Intuicom link sheets (epoch byte counters to Mbps)
+    'intuicom': {
+        'time': 'Date-Time', 'time_format': '%Y.%m.%d-%H.%M.%S',
+        'columns': {'AvgLatency (ms)': ('Latency', 1)},
+        'derive': intuicom_rates
+    },
+    # Encom link logs aggregated with encom_logs.read_link_logs
+    'encom': {
+        'time': 'DateTime',
+        'columns': {'Tx Rate (Mbps)': ('Tx Rate (Mbps)', 1), 'Rx Rate (Mbps)': ('Rx Rate (Mbps)', 1),
+                    'Tx CCQ (%)': ('Tx CCQ (%)', 1), 'Rx CCQ (%)': ('Rx CCQ (%)', 1)}
+    }
+}
+
+# function to list source columns an adapter reads (e.g. to read only those from the Parquet store)
+def source_columns(vendor):
+    adapter = adapters[vendor]
+
+    return [adapter['time']] + list(adapter['columns'])
+
+# function to map a raw vendor frame to the canonical schema in one pass
+# area and node are used for frames without Area/Node columns (e.g. one node per sheet)
+def normalize(df, vendor, area = None, node = None, decimals = None):
+    adapter = adapters[vendor]
+    n = len(df)
+
+    data = {}
+    data['Area'] = df['Area'].to_numpy(str) if 'Area' in df.columns else np.full(n, area, dtype = object)
+    data['Node'] = df['Node'].to_numpy(str) if 'Node' in df.columns else np.full(n, node, dtype = object)
+    data['DateTime'] = pd.to_datetime(df[adapter['time']], format = adapter.get('time_format')).to_numpy()
+
+    # unit conversion of every mapped column as one array multiply ("No Data" becomes nan)
+    for source, (column, scale) in adapter['columns'].items():
+        if source in df.columns:
+            data[column] = to_float(df[source]) * scale
+    if 'derive' in adapter:
+        data.update(adapter['derive'](df))
+
+    if decimals is not None:
+        for column in data:
+            if canonical_schema[column] is float:
+                data[column] = np.round(data[column], decimals)
+
+    # canonical column order, only columns the vendor provides
+    return pd.DataFrame({column: data[column] for column in canonical_schema if column in data})
+
+# function to read a canonical frame saved as tab-separated text
+def read_canonical(path):
+    return pd.read_csv(path, sep = '\t', parse_dates = ['DateTime'])
+
+# function to write a canonical frame as tab-separated text
+def write_canonical(df, path):
+    df.to_csv(path, sep = '\t', index = False)
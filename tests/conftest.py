@@ -0,0 +1,5 @@
+import os
+import sys
+
+# scripts are imported by plain module name, as when run from script/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'script'))
@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+
+from backtest import backtest, rolling_folds, result_cols
+
+
+def hourly_frame(days):
+    times = pd.date_range('2024-01-01', periods = days * 24, freq = 'h')
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({'Time': times, 'Node': 'A', 'Hour': times.hour,
+                         'Upload (Mbps)': rng.random(len(times))})
+
+
+def test_folds_walk_forward():
+    times = hourly_frame(16).Time.to_numpy()
+    folds = rolling_folds(times, train_days = 14, test_days = 1)
+
+    assert [(start, cut) for start, cut, _ in folds] == [(0, 14 * 24), (0, 15 * 24)]
+    assert folds[-1][2] == len(times)
+
+
+def test_short_data_has_no_folds():
+    bdf = backtest(hourly_frame(5), targets = ['Upload (Mbps)'], train_days = 14, test_days = 1)
+
+    assert bdf.empty
+    assert list(bdf.columns) == result_cols
@@ -0,0 +1,21 @@
+import time
+import numpy as np
+
+import instrument
+from instrument import stage
+
+
+def test_peak_rss_is_per_stage():
+    with stage('large'):
+        data = np.ones(50_000_000)
+        time.sleep(0.1)
+        del data
+    with stage('small'):
+        time.sleep(0.1)
+    large, small = instrument.records[-2:]
+    del instrument.records[-2:]
+
+    # about 400 MB are allocated and freed in the first stage only,
+    # the high-water mark of the process still includes them
+    assert large['peak_rss_mb'] - small['peak_rss_mb'] > 200
+    assert small['process_peak_rss_mb'] - small['peak_rss_mb'] > 200
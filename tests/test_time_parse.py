@@ -0,0 +1,28 @@
+import numpy as np
+import pandas as pd
+
+from time_parse import parse_vendor_time
+
+start = pd.Timestamp('2024-01-01')
+
+def test_valid_times():
+    times = parse_vendor_time(pd.Series(['Jan 05 13', 'Feb 29 01']), start)
+
+    assert list(times) == [np.datetime64('2024-01-05T13'), np.datetime64('2024-02-29T01')]
+
+def test_non_ascii_time_is_nat():
+    # non-breaking space as in Excel exports
+    times = parse_vendor_time(pd.Series(['Jan\xa005 13:00', 'Jan 05 13']), start)
+
+    assert np.isnat(times[0]) and not np.isnat(times[1])
+
+def test_timestamp_cell_is_nat():
+    # cell typed as a date by Excel
+    times = parse_vendor_time(pd.Series([pd.Timestamp('2024-01-05 13:00'), 'Jan 05 13'], dtype = object), start)
+
+    assert np.isnat(times[0]) and not np.isnat(times[1])
+
+def test_malformed_times_are_nat():
+    times = parse_vendor_time(pd.Series(['Jan 5 13:00', 'Feb 30 01', 'Mar 01 24', 'Xyz 01 01', None]), start)
+
+    assert np.isnat(times).all()
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from vendor_schema import normalize
+
+
+def test_radio_adapters_agree_on_packet_loss():
+    times = ['2024-01-01 00:00', '2024-01-01 01:00', '2024-01-01 02:00']
+    loss = [0.0, 0.015, 'No Data']
+    radio = normalize(pd.DataFrame({'Time': times, 'Packet Loss': loss}), 'radio', node = 'A')
+    flat = normalize(pd.DataFrame({'Time': times, 'Packet_Loss': loss}), 'radio_flat', node = 'A')
+
+    # canonical packet loss is in %
+    np.testing.assert_allclose(radio.PacketLoss, [0, 1.5, np.nan])
+    np.testing.assert_allclose(flat.PacketLoss, radio.PacketLoss)